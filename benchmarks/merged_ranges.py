@@ -0,0 +1,98 @@
+"""
+Times how long it takes to look up the width of the cells of a sheet with thousands of merged ranges: once by scanning
+all merged ranges of the openpyxl worksheet per cell (as XlsxProcessor did before the spans were mapped) and once by
+asking the snapshot which resolved the spans while it was built. As scanning takes time proportional to the count of
+merged ranges for each cell it is timed on a sample of the cells only. Run it from the root of the repository with:
+
+    python -m benchmarks.merged_ranges [row count]
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.worksheet.cell_range import CellRange
+
+from matcher.xlsx.snapshot.SheetSnapshot import SheetSnapshot, WorkbookSnapshot
+
+# each row holds this many merged ranges of two columns each followed by an unmerged column
+RANGES_PER_ROW = 4
+DEFAULT_ROW_COUNT = 1000
+# the count of cells the widths are looked up for by scanning the merged ranges
+SAMPLE_SIZE = 200
+
+
+def create_workbook(path: str, row_count: int) -> List[Tuple[int, int]]:
+    """
+    Writes a sheet which holds RANGES_PER_ROW merged ranges in each of its rows
+
+    :return: the row-column-tuples of all cells holding a value
+    """
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Teams"
+    cells = []
+    for row in range(1, row_count + 1):
+        for column in range(1, RANGES_PER_ROW * 3, 3):
+            sheet.cell(row, column).value = "team {}/{}".format(row, column)
+            sheet.cell(row, column + 2).value = "lead {}/{}".format(row, column)
+            sheet.merge_cells(start_row=row, start_column=column, end_row=row, end_column=column + 1)
+            cells.extend([(row, column), (row, column + 2)])
+    wb.save(path)
+    return cells
+
+
+def scan_merged_ranges(ranges: List[CellRange], cells: List[Tuple[int, int]]) -> List[int]:
+    """
+    Looks up the widths by walking the merged ranges for every cell like the lookup before the spans were mapped did
+    """
+    widths = []
+    for row, column in cells:
+        width = 1
+        for merged_cells in ranges:
+            if merged_cells.min_row <= row <= merged_cells.max_row and \
+                    merged_cells.min_col <= column <= merged_cells.max_col:
+                width = merged_cells.max_col - merged_cells.min_col + 1
+                break
+        widths.append(width)
+    return widths
+
+
+def ask_snapshot(sheet: SheetSnapshot, cells: List[Tuple[int, int]]) -> List[int]:
+    """
+    Looks up the widths in the spans the snapshot resolved while it was built
+    """
+    return [sheet.merged_span(row, column) for row, column in cells]
+
+
+def run(row_count: int) -> None:
+    """
+    Builds the sheet and prints the time a lookup takes on average with both approaches
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "merged.xlsx")
+        cells = create_workbook(path, row_count)
+        ranges = list(load_workbook(path)["Teams"].merged_cells.ranges)
+        snapshot = WorkbookSnapshot.load(path)["Teams"]
+    # an odd step mixes merged and unmerged cells into the sample
+    sample = cells[::(len(cells) // SAMPLE_SIZE) | 1]
+    print("{} merged ranges, {} occupied cells".format(len(ranges), len(cells)))
+    start = time.perf_counter()
+    before = scan_merged_ranges(ranges, sample)
+    before_time = (time.perf_counter() - start) / len(sample)
+    start = time.perf_counter()
+    after = ask_snapshot(snapshot, cells)
+    after_time = (time.perf_counter() - start) / len(cells)
+    if before != ask_snapshot(snapshot, sample):
+        raise AssertionError("The lookups disagree about the width of at least one cell")
+    if max(after) < 2:
+        raise AssertionError("The snapshot lost the merged ranges")
+    print("scanning the merged ranges: {:10.3f}us per cell ({} cells)".format(before_time * 1e6, len(sample)))
+    print("asking the snapshot:        {:10.3f}us per cell ({} cells)".format(after_time * 1e6, len(cells)))
+    print("speedup: {:.0f}x".format(before_time / after_time))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROW_COUNT)
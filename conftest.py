@@ -0,0 +1 @@
+# lets pytest put the root of the repository on the path so that the tests can import its packages
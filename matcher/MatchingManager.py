@@ -1,26 +1,47 @@
-from typing import Dict, List
+from typing import Dict, Callable, Tuple
 import logging
 
 from matcher.xlsx.XlsxProcessor import XlsxProcessor
+from matcher.xlsx.cache.WorkbookCache import WorkbookCache
+from matcher.xlsx.cache.SnapshotStore import SnapshotStore
+from matcher.xlsx.snapshot.SheetSnapshot import WorkbookSnapshot
+from matcher.xlsx.snapshot.ZipWorkbookReader import ZipWorkbookReader
 from matcher.xml.XmlProcessor import XmlProcessor
-from matcher.xml.generation.GeneratorCluster import ValuePathStruct, PathCluster
+from matcher.xml.generation.GenerationPlan import GenerationPlan
 from matcher.visualization.HtmlWriter import HtmlWriter
-from classifier.PathClassifier import PathClassifier
+from classifier.BinClassifier import PathClassifier
 from creation.FileSystem import create_directories_for, config_from_file
 
 
 class MatchingManager:
 
+    CACHE_ENTRIES_KEY = "workbook_cache_entries"
+    CACHE_BYTES_KEY = "workbook_cache_bytes"
+    SNAPSHOT_DIR_KEY = "snapshot_cache_dir"
+    READER_KEY = "xlsx_reader"
+    TRAINING_WORKERS_KEY = "training_workers"
+    BATCH_MATCHING_KEY = "batch_matching"
+    PREFETCH_WORKERS_KEY = "prefetch_workers"
+    GENERATION_WORKERS_KEY = "generation_workers"
+    # openpyxl is the reference the other readers have to deliver the same snapshots as
+    READERS: Dict[str, Callable[[str], WorkbookSnapshot]] = {
+        "openpyxl": WorkbookSnapshot.load,
+        "zip": ZipWorkbookReader.load
+    }
+
     __xlsx_handler: XlsxProcessor
     __xml_handler: XmlProcessor
     __config: Dict[str, str]
     __classifier: PathClassifier
+    __workbook_cache: WorkbookCache = None
     # store these files to bind them to the program
     __source_path: str
     __sink_path: str
     __nested_sink_dir: str
     __template_path: str
     __path_dict: Dict[str, str]
+    # derived from the trained paths alone -> kept until the next training
+    __generation_plan: GenerationPlan = None
 
     def __init__(self, config_path: str, log_file: str = "clustering.log"):
         """
@@ -49,20 +70,73 @@ class MatchingManager:
         self.__nested_sink_dir = (nested_sink_dir + "/") if not nested_sink_dir.endswith("/") else nested_sink_dir
         self.__source_path = source_path
         self.__xml_handler = XmlProcessor(self.__classifier, self.__config)
-        self.__xlsx_handler = XlsxProcessor(self.__classifier, self.__config, self.__sink_path, self.__nested_sink_dir)
-        for pair_list in self.__xml_handler.read_xml(self.__source_path):
-            self.__xlsx_handler.match_given_values_in(pair_list)
+        # one cache for the whole run so that every xlsx-file is parsed only once no matter how often it is accessed
+        reader_name = self.__config.get(self.READER_KEY, "openpyxl")
+        if reader_name not in self.READERS:
+            raise ValueError("Unknown xlsx reader '{}'. Choose one of: {}".format(reader_name,
+                                                                                ", ".join(self.READERS.keys())))
+        loader = self.READERS[reader_name]
+        if self.SNAPSHOT_DIR_KEY in self.__config:
+            # and if configured even only once as long as the file does not change
+            loader = SnapshotStore(self.__config[self.SNAPSHOT_DIR_KEY], loader).load
+        if self.__workbook_cache is not None:
+            # a previous training may still load files in background
+            self.__workbook_cache.close()
+        self.__workbook_cache = WorkbookCache(int(self.__config.get(self.CACHE_ENTRIES_KEY, 0)),
+                                              int(self.__config.get(self.CACHE_BYTES_KEY, 0)), loader)
+        self.__xlsx_handler = XlsxProcessor(self.__classifier, self.__config, self.__sink_path, self.__nested_sink_dir,
+                                            self.__workbook_cache)
+        prefetch_workers = int(self.__config.get(self.PREFETCH_WORKERS_KEY, 0))
+        if prefetch_workers > 0:
+            # let the files the root file forwards to be loaded while the root file is scanned
+            self.__xlsx_handler.prefetch_forwarded_files(prefetch_workers)
+        workers = int(self.__config.get(self.TRAINING_WORKERS_KEY, 1))
+        try:
+            if workers > 1 or self.__config.get(self.BATCH_MATCHING_KEY, False):
+                # remember which source path each list belongs to as the matches are only pushed after all lists are
+                # read
+                pair_lists = [(self.__classifier.get_active_source_path(), x)
+                              for x in self.__xml_handler.read_xml(self.__source_path)]
+                if workers > 1:
+                    self.__xlsx_handler.match_given_value_lists_in_parallel(pair_lists, workers)
+                else:
+                    self.__xlsx_handler.match_all_given_values_in(pair_lists)
+            else:
+                for pair_list in self.__xml_handler.read_xml(self.__source_path):
+                    self.__xlsx_handler.match_given_values_in(pair_list)
+        finally:
+            # the files are prefetched for the matching only -> the loads finished so far stay available for the
+            # generation
+            self.__workbook_cache.close()
         # digest the whole pile of data
         self.__classifier.train()
         # due to the tree structure of the XML it makes more sense that the XmlProcessor gives the structure and the
         # XlsxProcessor acts only as server
         self.__path_dict = {y: x for x, y in self.__classifier.to_dict().items()}
+        self.__generation_plan = None
         # check there isn't any path which has multiple index identifiers -> this would probably require recursive
         # GeneratorStructs which aren't at hand
         for path in self.__path_dict.keys():
             if path.count("[i]") > 1:
                 raise AssertionError("Do not have the means to treat complex paths like '{}'! Aborting".format(path))
 
+    def get_trained_paths(self) -> Dict[str, str]:
+        """
+        Returns the paths the classifier learned in the last training
+
+        :return: a dictionary from sink paths to source paths
+        """
+        return self.__classifier.to_dict()
+
+    def get_sheet_scan_counts(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns per sheet of the sink file how often the training skipped it as it held none of the data of a pair list
+        and how often it was scanned
+
+        :return: a dictionary of sheet title to the tuple of the skip count and the scan count
+        """
+        return self.__xlsx_handler.get_scan_counts()
+
     def create_build_environment(self, template_path: str) -> None:
         """
         Creates the files which are required to build a XML-file from "scratch"
@@ -79,24 +153,32 @@ class MatchingManager:
         :param new_file_path: the path under which to store the result
         :return: the number of nodes added to the generated file
         """
-        # the XML-modules knows their paths best -> so let it do some meaningful ordering of their paths
-        target_classes = self.__xml_handler.group_target_paths(list(self.__path_dict.keys()))
-        # group the ValuePathStructs by classes in separate lists -> TODO: their could be a more elegant way?
-        cluster_list: List[List[PathCluster]] = []
-        class_index = 0
-        for target_class in target_classes:
-            cluster_list.append([])
-            target_names = self.__xlsx_handler.get_names(self._translate_to_xlsx_name_path(target_class.root_path))
-            for name in target_names:
-                current = PathCluster(name, target_class.name_path, target_class.root_path)
-                for source_path in target_class.node_paths:
-                    values = self.__xlsx_handler.receive_for_path(self.__path_dict[source_path], name,
-                                                                  self.__nested_sink_dir)
-                    current.add_pair(ValuePathStruct(name, values, source_path))
-                cluster_list[class_index].append(current)
-            class_index += 1
+        workers = int(self.__config.get(self.GENERATION_WORKERS_KEY, 1))
+        cluster_list = self.__get_generation_plan().execute(self.__xlsx_handler, self.__nested_sink_dir, workers)
         return self.__xml_handler.write_xml(new_file_path, self.__template_path, cluster_list)
 
+    def dump_generation_plan(self, file: str) -> None:
+        """
+        Writes the plan the generation works through as JSON: the classes with the parsed sink path of each of their
+        nodes and the order in which the sheets are read
+
+        :param file: the file to write the JSON data into
+        """
+        with open(file, "w", encoding="utf-8") as json_file:
+            json_file.write(self.__get_generation_plan().to_json())
+
+    def __get_generation_plan(self) -> GenerationPlan:
+        """
+        Returns the plan to generate the XML-file with which is only compiled once per training
+        """
+        if self.__generation_plan is None:
+            # the XML-modules knows their paths best -> so let it do some meaningful ordering of their paths
+            target_classes = self.__xml_handler.group_target_paths(list(self.__path_dict.keys()))
+            name_paths = [self._translate_to_xlsx_name_path(x.root_path) for x in target_classes]
+            self.__generation_plan = GenerationPlan.compile(target_classes, name_paths, self.__path_dict,
+                                                            self.__xlsx_handler)
+        return self.__generation_plan
+
     def _translate_to_xlsx_name_path(self, xml_base_path: str) -> str:
         """
         Takes the given xml path and translates it to a name path for the given source-file-class the base path is
@@ -0,0 +1,58 @@
+from __future__ import annotations
+from typing import Iterator, List
+
+from matcher.clustering.ValueNamePair import ValueNamePair
+
+
+class PairColumn:
+    """
+    Holds the value-name pairs of one path as two columns: the values and the names at the same index form a pair. All
+    paths of the same list of nodes share one list of names so that a pair costs no more than its entry in the list of
+    values
+    """
+
+    __slots__ = ("values", "names")
+
+    values: List[str]
+    names: List[str]
+
+    def __init__(self, values: List[str], names: List[str]):
+        """
+        The constructor. Like zip() the pairs end with the shorter one of the given lists
+
+        :param values: the values of the pairs
+        :param names: the associated names in the same order as the values they belong to. The list is not copied and
+                      must not be altered afterwards as it is meant to be shared
+        """
+        self.values = values if len(values) <= len(names) else values[:len(names)]
+        self.names = names
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[ValueNamePair]:
+        for i in range(len(self.values)):
+            yield ValueNamePair(self.values[i], self.names[i])
+
+    def get_names(self) -> List[str]:
+        """
+        Returns the names of the pairs. As the list of names is shared it is only copied if it holds more names than
+        there are values
+
+        :return: the names in the order of the values they belong to
+        """
+        if len(self.names) == len(self.values):
+            return self.names
+        return self.names[:len(self.values)]
+
+    @staticmethod
+    def of(value_name_pairs: Iterator[ValueNamePair]) -> PairColumn:
+        """
+        Returns the given pairs as columns. If columns are given they are returned as they are
+
+        :param value_name_pairs: either value-name pairs or existing columns
+        :return: the pairs as columns
+        """
+        if isinstance(value_name_pairs, PairColumn):
+            return value_name_pairs
+        return PairColumn(*ValueNamePair.unzip(value_name_pairs))
@@ -1,19 +1,26 @@
 from __future__ import annotations
 from typing import Tuple, Iterator, Dict, Set, List
+from concurrent.futures import ProcessPoolExecutor
+import copy
 import re
 import os
-from openpyxl import load_workbook
-from openpyxl.cell.cell import Cell
-from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.utils import get_column_letter, column_index_from_string
 
 from matcher.enum.CellPropertyType import CellPropertyType
-from matcher.xlsx.clustering.CellMatching import CellMatchingStruct, CellMatchResult
+from matcher.xlsx.clustering.CellMatching import CellMatchingStruct, CellMatchResult, CellMatchingLookup
 from matcher.xlsx.location.CellPositioning import CellPosition, CellPositionStruct, CellPositionStructType
-from classifier.PathClassifier import PathClassifier
+from matcher.xlsx.location.HeaderLayout import HeaderLayout
+from matcher.xlsx.location.SinkPath import SinkPath, SinkPathType
+from classifier.BinClassifier import PathClassifier
 from classifier.error.MatchExceptions import ForwardFileNotFound
 from matcher.clustering.ValueNamePair import ValueNamePair
+from matcher.clustering.PairColumn import PairColumn
 from matcher.xlsx.clustering.CrossTableStruct import CrossTableStruct
+from matcher.xlsx.cache.WorkbookCache import WorkbookCache
+from matcher.xlsx.index.SheetIndex import SheetIndex
+from matcher.xlsx.index.CrossMarkers import CrossMarkers
+from matcher.xlsx.snapshot.SheetSnapshot import SheetSnapshot, SnapshotCell, WorkbookSnapshot
+from matcher.xlsx.parallel.MatchRecorder import MatchRecorder
 
 
 class XlsxProcessor:
@@ -28,12 +35,18 @@ class XlsxProcessor:
     __config = {}
     __root_xlsx: str
     __nested_xlsx_dir: str
+    __workbooks: WorkbookCache
+    # sheet title -> how often the sheet was skipped and how often it was scanned for a list of pairs
+    __scan_counts: Dict[str, List[int]]
+    # the processor of the current worker process (if it is one) -> set once by the pool initializer
+    __scan_worker: XlsxProcessor = None
 
     def __init__(self,
                  sink: PathClassifier,
                  config: Dict[str, str],
                  path_root_xlsx: str,
-                 nested_xlsx_dir: str = "nested/"):
+                 nested_xlsx_dir: str = "nested/",
+                 workbook_cache: WorkbookCache = None):
         """
         The constructor
 
@@ -41,9 +54,12 @@ class XlsxProcessor:
         :param config: a dictionary constructed from the config file
         :param path_root_xlsx: the path to the main Excel file
         :param nested_xlsx_dir: the path to the other Excel files which the root file might reference to
+        :param workbook_cache: the cache to receive parsed workbooks from. If none is given an unbounded one is created
         """
         self.__classifier = sink
         self.__config = config
+        self.__workbooks = workbook_cache if workbook_cache is not None else WorkbookCache()
+        self.__scan_counts = {}
         self.__root_xlsx = path_root_xlsx
         root_file_name = re.search(r"\b\w*\.xlsx$", path_root_xlsx).group(0)
         root_path = path_root_xlsx[:-len(root_file_name)]
@@ -57,11 +73,164 @@ class XlsxProcessor:
 
         :param value_name_pairs: a list of tuples with values and their corresponding URI
         """
-        wb = load_workbook(self.__root_xlsx)
+        wb = self.__workbooks.get(self.__root_xlsx)
+        # hash the pairs once -> every line scanned for them shares the lookup
+        value_name_pairs = CellMatchingLookup.of(value_name_pairs)
         for sheet in wb.sheetnames:
-            self._check_row_wise(wb[sheet], value_name_pairs, self.__root_xlsx)
-            self._check_column_wise(wb[sheet], value_name_pairs, self.__root_xlsx)
-            self._check_as_cross_table(wb[sheet], value_name_pairs, self.__root_xlsx)
+            if self.__holds_any_of(wb[sheet], value_name_pairs):
+                self.__scan_sheet(wb[sheet], value_name_pairs)
+
+    def match_all_given_values_in(self, pair_lists: List[Tuple[str, PairColumn]]) -> None:
+        """
+        Does the same as match_given_values_in for all given lists at once: the values and names of all lists are
+        looked up together in one pass over the index of each sheet. Afterwards every list only visits the lines
+        holding its own data (and the headers) while sheets without any of its data are skipped entirely. The matches
+        are pushed in the same order as with one call of match_given_values_in per list
+
+        :param pair_lists: tuples of the source path the pairs belong to and the list of value-name pairs
+        """
+        wb = self.__workbooks.get(self.__root_xlsx)
+        lookups = [CellMatchingLookup.of(pairs) for _, pairs in pair_lists]
+        # value or name -> the ids of the lists which contain it
+        owners: Dict[str, List[int]] = {}
+        for list_id, lookup in enumerate(lookups):
+            for i in range(len(lookup)):
+                for wanted in (lookup.pairs.values[i], lookup.pairs.names[i]):
+                    list_ids = owners.setdefault(wanted, [])
+                    if not list_ids or list_ids[-1] != list_id:
+                        list_ids.append(list_id)
+        # sheet name -> list id -> the rows and the columns the list has data in
+        hits: Dict[str, Dict[int, Tuple[Set[int], Set[int]]]] = {}
+        for sheet in wb.sheetnames:
+            index = self.__index_of(wb[sheet])
+            hits[sheet] = {}
+            for wanted, list_ids in owners.items():
+                for row, column in index.positions_of(wanted):
+                    for list_id in list_ids:
+                        rows, columns = hits[sheet].setdefault(list_id, (set(), set()))
+                        rows.add(row)
+                        columns.add(column)
+        for list_id, lookup in enumerate(lookups):
+            # all source paths are registered already -> activate the one the matches of this list belong to
+            self.__classifier.add_source_path(pair_lists[list_id][0])
+            for sheet in wb.sheetnames:
+                counts = self.__scan_counts.setdefault(sheet, [0, 0])
+                if list_id not in hits[sheet]:
+                    # neither of the tables can be detected without any of the data
+                    counts[0] += 1
+                    continue
+                counts[1] += 1
+                rows, columns = hits[sheet][list_id]
+                self._check_row_wise(wb[sheet], lookup, self.__root_xlsx, candidate_rows=rows)
+                self._check_column_wise(wb[sheet], lookup, self.__root_xlsx, candidate_columns=columns)
+                self._check_as_cross_table(wb[sheet], lookup, self.__root_xlsx)
+
+    def match_given_value_lists_in_parallel(self, pair_lists: List[Tuple[str, PairColumn]],
+                                            workers: int) -> None:
+        """
+        Does the same as match_given_values_in for all given lists at once but scans the sheets in separate processes.
+        The matches are pushed into the classifier in the same order the serial scan would push them so that the
+        results do not differ
+
+        :param pair_lists: tuples of the source path the pairs belong to and the list of value-name pairs
+        :param workers: the number of processes to scan with
+        """
+        wb = self.__workbooks.get(self.__root_xlsx)
+        # only hand out the sheets which hold any of the data
+        tasks = []
+        sources = []
+        for source, pairs in pair_lists:
+            for sheet in wb.sheetnames:
+                if self.__holds_any_of(wb[sheet], pairs):
+                    tasks.append((pairs, sheet))
+                    sources.append(source)
+        # hand out the tasks in chunks to keep the overhead of the communication low but the load balanced
+        chunk_size = max(1, len(tasks) // (workers * 4))
+        worker = self.create_worker()
+        with ProcessPoolExecutor(workers, initializer=XlsxProcessor._init_scan_worker, initargs=(worker,)) as pool:
+            # map() returns the results in the order of the tasks no matter which worker finished first
+            for source, matches in zip(sources, pool.map(XlsxProcessor._scan_in_worker, tasks, chunksize=chunk_size)):
+                for match in matches:
+                    self.__classifier.add_potential_match(match, source)
+
+    def create_worker(self) -> XlsxProcessor:
+        """
+        Creates the copy of this processor a worker process works with: the classifier stays with the parent as the
+        worker only records its matches and the cache starts empty as the worker parses the files on its own
+
+        :return: the copy to hand to the worker processes
+        """
+        worker = copy.copy(self)
+        worker.__classifier = MatchRecorder()
+        worker.__workbooks = self.__workbooks.clone_empty()
+        return worker
+
+    @staticmethod
+    def _init_scan_worker(processor: XlsxProcessor) -> None:
+        """
+        Stores the processor the current worker process shall scan with
+        """
+        XlsxProcessor.__scan_worker = processor
+
+    @staticmethod
+    def _scan_in_worker(task: Tuple[PairColumn, str]) -> List[str]:
+        """
+        Scans one sheet of the root file for one list of value-name pairs inside a worker process
+
+        :param task: the tuple of the pairs and the name of the sheet to scan
+        :return: the match paths found in the order they were found
+        """
+        worker = XlsxProcessor.__scan_worker
+        pairs, sheet_name = task
+        worker.__scan_sheet(worker.__workbooks.get(worker.__root_xlsx)[sheet_name], CellMatchingLookup.of(pairs))
+        return worker.__classifier.take()
+
+    def __scan_sheet(self, sheet: SheetSnapshot, value_name_pairs: CellMatchingLookup) -> None:
+        """
+        Runs all kinds of table detection on the given sheet of the root file
+
+        :param sheet: the sheet to scan
+        :param value_name_pairs: the pairs to find
+        """
+        self._check_row_wise(sheet, value_name_pairs, self.__root_xlsx)
+        self._check_column_wise(sheet, value_name_pairs, self.__root_xlsx)
+        self._check_as_cross_table(sheet, value_name_pairs, self.__root_xlsx)
+
+    def prefetch_forwarded_files(self, workers: int) -> None:
+        """
+        Collects the files the forwarding cells of the root file point to and lets the cache load them in background
+        threads while the root file is scanned
+
+        :param workers: the maximum number of files to load at the same time
+        """
+        wb = self.__workbooks.get(self.__root_xlsx)
+        targets: Dict[str, None] = {}
+        for sheet_name in wb.sheetnames:
+            sheet = wb[sheet_name]
+            for by_row in [True, False]:
+                for position in self.__header_layout(sheet, by_row).forward_positions():
+                    # the file names are listed below (or right of) the header cell which marks the forwarding
+                    if by_row:
+                        cells = sheet.occupied_column(column_index_from_string(position.column), position.row + 1)
+                    else:
+                        cells = sheet.occupied_row(position.row, column_index_from_string(position.column) + 1)
+                    for cell in cells:
+                        if not isinstance(cell.value, str):
+                            continue
+                        file_path = self.__nested_xlsx_dir + cell.value
+                        if os.path.exists(file_path):
+                            targets[file_path] = None
+        self.__workbooks.prefetch(targets.keys(), workers)
+
+    def get_scan_counts(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns for every sheet of the root file how much scanning has been avoided by checking the sheet for the data
+        first
+
+        :return: a dictionary of sheet title to the count of pair lists the sheet was skipped for and the count of pair
+                 lists it was scanned for
+        """
+        return {x: (y[0], y[1]) for x, y in self.__scan_counts.items()}
 
     def receive_for_path(self, path: str, name: str, nested_path: str = "") -> List[str]:
         """
@@ -72,15 +241,84 @@ class XlsxProcessor:
         :param nested_path: the path to use when following a file forwarding
         :return: the value addressed
         """
+        return self.receive_for_sink_path(self.compile_path(path), name, nested_path)
+
+    def receive_for_sink_path(self, sink_path: SinkPath, name: str, nested_path: str = "") -> List[str]:
+        """
+        Works like receive_for_path() but with a path which has been parsed by compile_path() already
+
+        :param sink_path: the parsed path to the information in the excel table
+        :param name: the name to the value wanted
+        :param nested_path: the path to use when following a file forwarding
+        :return: the value addressed
+        """
+        return self.receive_for_sink_path_batch(sink_path, [name], nested_path)[name]
+
+    def receive_for_path_batch(self, path: str, names: Iterator[str], nested_path: str = "") -> Dict[str, List[str]]:
+        """
+        Resolves the given path once and translates all of the names into their associated value (list) in the excel
+        file
+
+        :param path: the path to the information in the excel table
+        :param names: the names to the values wanted
+        :param nested_path: the path to use when following a file forwarding
+        :return: a dictionary of each name to the value addressed by it
+        """
+        return self.receive_for_sink_path_batch(self.compile_path(path), names, nested_path)
+
+    def receive_for_sink_path_batch(self, sink_path: SinkPath, names: Iterator[str],
+                                    nested_path: str = "") -> Dict[str, List[str]]:
+        """
+        Works like receive_for_path_batch() but with a path which has been parsed by compile_path() already
+
+        :param sink_path: the parsed path to the information in the excel table
+        :param names: the names to the values wanted
+        :param nested_path: the path to use when following a file forwarding
+        :return: a dictionary of each name to the value addressed by it
+        """
+        if sink_path.table_type == SinkPathType.CROSS_TABLE:
+            # is a cross-table -> no forwarding here so tackle the problem just straight on
+            return self._get_from_cross_table(names, sink_path)
+        # is a row- or column-table
+        return self._get_from_linear_table(names, sink_path, nested_path)
+
+    def compile_path(self, path: str) -> SinkPath:
+        """
+        Parses the given path (as the classifier learned it) into the parts which are required to read values with it
+
+        :param path: the path to the information in the excel table
+        :return: the parsed path
+        """
         path_parts = path.split(";")
         if len(path_parts) == 3:
-            # is a cross-table -> no forwarding here so tackle the problem just straight on
-            return self._get_from_cross_table(name, path_parts[0], path_parts[1], path_parts[2])
-        if len(path_parts) == 2:
-            # is a row- or column-table
-            return self._get_from_linear_table(name, path_parts[0], path_parts[1], nested_path)
-        else:
+            file_name, sheet_name = self.__disassemble_base_path(path_parts[0])
+            value_position, value_is_fixed_row = CellPosition.from_cell_path_position(path_parts[1])
+            name_position, name_is_fixed_row = CellPosition.from_cell_path_position(path_parts[2])
+            cross_area = CellPosition.from_cell_path_position(path_parts[0])[0]
+            return SinkPath.create_cross_table(path, file_name, sheet_name, cross_area, value_position,
+                                               value_is_fixed_row, name_position, name_is_fixed_row)
+        if len(path_parts) != 2:
             raise AttributeError("Can't decode the type of the table the path '{}' represents".format(path))
+        value_path_nodes = self.__disassemble_base_path(path_parts[0])
+        forwarding_node_index = -1
+        for i in range(len(value_path_nodes)):
+            if self.__config[self.FORWARDING_PATH_KEY] in value_path_nodes[i]:
+                forwarding_node_index = i
+                break
+        value_position, value_is_fixed_row = CellPosition.from_cell_path_position(path_parts[0])
+        name_position, name_is_fixed_row = CellPosition.from_cell_path_position(path_parts[1])
+        if forwarding_node_index == -1:
+            # means no forwarding is present -> all data can be found in one table
+            return SinkPath.create_linear_table(path, value_path_nodes[0], value_path_nodes[1], value_position,
+                                                value_is_fixed_row, name_position, name_is_fixed_row)
+        # the names are found in the table the name path points to
+        name_path_nodes = self.__disassemble_base_path(path_parts[1])
+        forward_node = value_path_nodes[forwarding_node_index]
+        forwarding_index = int(forward_node[len(self.__config[self.FORWARDING_PATH_KEY]):])
+        # the sheet name of the forwarding path comes after the forwarding symbol
+        return SinkPath.create_forwarded_table(path, name_path_nodes[0], name_path_nodes[1], value_position,
+                                               value_is_fixed_row, name_position, name_is_fixed_row,
+                                               forwarding_index, value_path_nodes[forwarding_node_index + 1])
 
     @staticmethod
     def extract_name_path(value_name_path: str) -> str:
@@ -115,20 +353,15 @@ class XlsxProcessor:
         :return: an set holding all names found
         """
         file_name, sheet_name = self.__disassemble_base_path(sink_name_path)
-        wb = load_workbook(file_name)
+        wb = self.__workbooks.get(file_name)
         position, is_fixed_row = CellPosition.from_cell_path_position(sink_name_path)
-        names = []
         # the name path will never have forwarding in this scenario so just interpret the next piece as sheet and check
         # the given positions content
-        sheet = wb[sheet_name]
-        for cell in XlsxProcessor.__get_cell_line_iterator(sheet, position, is_fixed_row):
-            if cell.value is None:
-                continue
-            names.append(cell.value)
-        return set(names)
+        return set(self.__name_line_index(wb[sheet_name], position, is_fixed_row).keys())
 
-    def _check_row_wise(self, sheet: Worksheet, value_name_pairs: Iterator[ValueNamePair],
-                        path: str, check_for_value_only: bool = False) -> CellPositionStruct:
+    def _check_row_wise(self, sheet: SheetSnapshot, value_name_pairs: Iterator[ValueNamePair],
+                        path: str, check_for_value_only: bool = False,
+                        candidate_rows: Set[int] = None) -> CellPositionStruct:
         """
         Iterates through the rows of the sheet given and tries to match the given list of value-URI-pairs in a row-wise
         fashion. If a match could be made the resulting path is pushed into the classifier
@@ -137,22 +370,29 @@ class XlsxProcessor:
         :param value_name_pairs: the stuff (hopefully) to find in the sheet given
         :param path: the path to the current sheet (excluding the sheet itself)
         :param check_for_value_only: set this flag to return immediately after a value from the list is found
+        :param candidate_rows: the rows which hold any of the values or names. Looked up if not given
         :return a LineResultStruct if only a value has been found: this is important for forwarded searches else an
                 invalid / empty struct
         """
         current_sheet_path = "{}/{}".format(path, sheet.title)
+        value_name_pairs = CellMatchingLookup.of(value_name_pairs)
         lowest_header_row = -1
         forward_index = -1
-        handle_forwarding, forwarding_column_name = self.__includes_forwarding(sheet.title)
-        color_key = "header_{}".format(sheet.title)
-        if color_key not in self.__config:
-            raise AssertionError("Missing key '{}' for retrieving the header color".format(color_key))
-        header_color = self.__config[color_key]
-        row_index = 0   # start with zero to be conform with xlsx
-        for row in sheet.iter_rows():
-            row_index += 1
-            result = self.__scan_cell_line_for(row, current_sheet_path, sheet, value_name_pairs, forward_index,
-                                               header_color, "" if not handle_forwarding else forwarding_column_name)
+        header_rows = self.__header_layout(sheet, True)
+        if not check_for_value_only and not header_rows.has_header():
+            # no pair can be assigned without a header
+            return CellPositionStruct.create_no_find()
+        if candidate_rows is None:
+            candidate_rows = self.__candidate_lines(sheet, value_name_pairs, True)
+        # rows which neither hold any of the data nor a header can't change the outcome -> only visit the others
+        for row_index in sorted(header_rows.lines_from(candidate_rows, not check_for_value_only)):
+            if row_index not in candidate_rows:
+                # a header row without any of the data reads the same for all pairs
+                result = header_rows.result_of(row_index)
+            else:
+                result = self.__scan_cell_line_for(sheet.occupied_row(row_index), current_sheet_path, sheet,
+                                                   value_name_pairs, forward_index, header_rows.header_color,
+                                                   header_rows.forward_name)
             if result.read_result == CellPositionStructType.NO_FINDING:
                 continue
             elif result.read_result == CellPositionStructType.HEADER_FOUND:
@@ -197,8 +437,9 @@ class XlsxProcessor:
         # if something was found it has been pushed to the classifier already -> so no need to return anything
         return CellPositionStruct.create_no_find()
 
-    def _check_column_wise(self, sheet: Worksheet, value_name_pairs: Iterator[ValueNamePair],
-                           path: str, check_for_value_only: bool = False) -> CellPositionStruct:
+    def _check_column_wise(self, sheet: SheetSnapshot, value_name_pairs: Iterator[ValueNamePair],
+                           path: str, check_for_value_only: bool = False,
+                           candidate_columns: Set[int] = None) -> CellPositionStruct:
         """
         Iterates through the columns of the sheet given and tries to match the given list of value-URI-pairs in a
         column-wise fashion. If a match could be made the resulting path is pushed into the classifier
@@ -207,19 +448,27 @@ class XlsxProcessor:
         :param value_name_pairs: the stuff (hopefully) to find in the sheet given
         :param path: the path to the current sheet (excluding the sheet itself)
         :param check_for_value_only: set this flag to return immediately after a value from the list is found
+        :param candidate_columns: the columns which hold any of the values or names. Looked up if not given
         :return a LineResultStruct if only a value has been found: this is important for forwarded searches else an
                 invalid / empty struct
         """
         current_sheet_path = "{}/{}".format(path, sheet.title)
+        value_name_pairs = CellMatchingLookup.of(value_name_pairs)
         lowest_header_col = -1
         forward_index = -1
-        handle_forwarding, forwarding_row_name = self.__includes_forwarding(sheet.title)
-        header_color = self.__config["header_{}".format(sheet.title)]
-        col_index = -1
-        for column in sheet.iter_cols():
-            col_index += 1
-            result = self.__scan_cell_line_for(column, current_sheet_path, sheet, value_name_pairs, forward_index,
-                                               header_color, "" if not handle_forwarding else forwarding_row_name)
+        header_columns = self.__header_layout(sheet, False)
+        if not check_for_value_only and not header_columns.has_header():
+            return CellPositionStruct.create_no_find()
+        if candidate_columns is None:
+            candidate_columns = self.__candidate_lines(sheet, value_name_pairs, False)
+        for column_number in sorted(header_columns.lines_from(candidate_columns, not check_for_value_only)):
+            col_index = column_number - 1
+            if column_number not in candidate_columns:
+                result = header_columns.result_of(column_number)
+            else:
+                result = self.__scan_cell_line_for(sheet.occupied_column(column_number), current_sheet_path, sheet,
+                                                   value_name_pairs, forward_index, header_columns.header_color,
+                                                   header_columns.forward_name)
             if result.read_result == CellPositionStructType.NO_FINDING:
                 continue
             elif result.read_result == CellPositionStructType.HEADER_FOUND:
@@ -261,7 +510,7 @@ class XlsxProcessor:
         # if something was found it has been pushed to the classifier already -> so no need to return anything
         return CellPositionStruct.create_no_find()
 
-    def _check_as_cross_table(self, sheet: Worksheet, value_name_pairs: Iterator[ValueNamePair], path: str) -> None:
+    def _check_as_cross_table(self, sheet: SheetSnapshot, value_name_pairs: Iterator[ValueNamePair], path: str) -> None:
         """
         Iterates through the sheet and tries to determine if the sheet could contain a cross table where names and
         values are distributed along a column and a row and their clustering is indicated by a 'X' in the field below
@@ -273,21 +522,14 @@ class XlsxProcessor:
 
         def find_xs(start_row: int, how_many: int) -> bool:
             """
-            Goes through the rows below the given one and counts every single X it encounters: if the count reaches the
-            how_many-argument true is returned
+            Counts every single X in the rows below the given one: if the count reaches the how_many-argument true is
+            returned
 
             :param start_row: the row to start searching at
             :param how_many: the many x's should be found
             :return: true if the expected count was reached else false
             """
-            x_count = 0
-            for row in sheet.iter_rows(min_row=start_row):
-                for cell in row:
-                    if cell.value == "x" or cell.value == "X":
-                        x_count += 1
-                    if x_count >= how_many:
-                        return True
-            return False
+            return self.__cross_markers(sheet).count_from(start_row) >= how_many
 
         def scan_columns_for_list(pair_list: Iterator[ValueNamePair]) -> Tuple[bool, CrossTableStruct]:
             """
@@ -298,8 +540,10 @@ class XlsxProcessor:
             :return: a tuple with true and the required data to continue or false and an useless struct if nothing could
                      be found
             """
-            for col in sheet.iter_cols():
-                list_found, first_data = CrossTableStruct.values_exist_in(col, pair_list)
+            columns = CellMatchingLookup.of(pair_list).pairs
+            for column_number in sorted(self.__candidate_lines(sheet, pair_list, False)):
+                col = sheet.occupied_column(column_number)
+                list_found, first_data = CrossTableStruct.values_exist_in(col, columns)
                 if list_found:
                     return True, first_data
             return False, CrossTableStruct()
@@ -312,14 +556,17 @@ class XlsxProcessor:
             :param data: the struct that holds all the required data
             :return: a tuple if enough values could be found and the updated struct in this case
             """
-            for row in sheet.iter_rows(max_row=data.first_find.row):
+            for row_index in sorted(self.__candidate_lines(sheet, value_name_pairs, True)):
+                if row_index > data.first_find.row:
+                    break
+                row = sheet[row_index]
                 found_list = data.find_other_pair_values_in(row)
                 if found_list:
                     # the second position had been stored with the check already
                     return True, data
             return False, data
 
-        def find_data_field_start(to_scan: Iterator[Cell]) -> CellPosition:
+        def find_data_field_start(to_scan: Iterator[SnapshotCell]) -> CellPosition:
             """
             Triggers on the first color change of cell background color that does come after a cell that was not white
 
@@ -386,11 +633,32 @@ class XlsxProcessor:
         file_path = self.__nested_xlsx_dir + file_name
         if not os.path.exists(file_path):
             raise ForwardFileNotFound("Could not find {} file under: {}".format(file_name, file_path))
+        wb = self.__workbooks.get(file_path)
+        # the same value is forwarded to the same file for many pair lists -> resolve it only once per parsed file
+        # and hand out copies as the callers alter the result
+        memo: Dict[Tuple[str, int, str], CellPositionStruct] = self.__workbooks.workbook_data(wb, "forwarding",
+                                                                                               lambda _: {})
+        key = (testing_struct.get_missing_entry(), forwarding_index, work_path)
+        if key not in memo:
+            memo[key] = self.__search_forwarded_value(wb, work_path, testing_struct.get_missing_entry(),
+                                                      forwarding_index)
+        return memo[key].copy()
+
+    def __search_forwarded_value(self, wb: WorkbookSnapshot, work_path: str, value: str,
+                                 forwarding_index: int) -> CellPositionStruct:
+        """
+        Searches the sheets of the forwarded file for the given value: row-wise first then column-wise
+
+        :param wb: the workbook the forwarding points to
+        :param work_path: the internal path which describes the "address" from the root-file
+        :param value: the value to find
+        :param forwarding_index: the index of the column or row that triggered the forwarding
+        :return: A CellPositionStruct of "type" value_found or no_find
+        """
         path = work_path + "/{}{}".format(self.__config[self.FORWARDING_PATH_KEY], forwarding_index)
         # create a dummy list which only contains the missing entry -> which has to be value else the forwarding would
         # be stupid
-        value_pair: Iterator[ValueNamePair] = [ValueNamePair.create_with_value(testing_struct.get_missing_entry())]
-        wb = load_workbook(file_path)
+        value_pair: Iterator[ValueNamePair] = [ValueNamePair.create_with_value(value)]
         for sheet in wb.sheetnames:
             # return the first value found
             result_row = self._check_row_wise(wb[sheet], value_pair, path, True)
@@ -401,100 +669,96 @@ class XlsxProcessor:
                 return result_col
         return CellPositionStruct.create_no_find()
 
-    def _get_from_cross_table(self, to_find: str, cross_area_path: str, value_path: str, name_path: str) -> List[str]:
-        """
-        Treats the sheet under the given name as cross table and extracts the data of it by checking for the name
-        (to_find) and associate all values marked with "x" with it
-
-        :param to_find: the name in question
-        :param cross_area_path: the path that addresses the cross area. This path should also contain the file path
-        :param value_path: the path to the first value cell which should only consist of the value cell position
-        :param name_path: the path to the first name cell which should only consist of the name cell position
-        :return: all values that could be associated with the given name
-        """
-        values_tuple = CellPosition.from_cell_path_position(value_path)
-        names_tuple = CellPosition.from_cell_path_position(name_path)
-        cross_area = CellPosition.from_cell_path_position(cross_area_path)[0]
-        file_name, sheet_name = self.__disassemble_base_path(cross_area_path)
-        wb = load_workbook(file_name)
-        sheet = wb[sheet_name]
-        name_position, is_fixed_row = names_tuple
-        for cell in XlsxProcessor.__get_cell_line_iterator(sheet, name_position, is_fixed_row):
-            if cell.value != to_find:
-                continue
-            if is_fixed_row:
-                cross_area.column = cell.column_letter
-            else:
-                cross_area.row = cell.row
-            break
+    def _get_from_cross_table(self, names: Iterator[str], sink_path: SinkPath) -> Dict[str, List[str]]:
+        """
+        Treats the sheet under the given name as cross table and extracts the data of it by checking for the names
+        and associate all values marked with "x" with each of them
 
-        value_template, name_is_fixed_row = values_tuple
-        value_list = []
-        for cross_cell in XlsxProcessor.__get_cell_line_iterator(sheet, cross_area, not is_fixed_row):
-            if cross_cell.value is None:
-                continue
-            if "x" not in cross_cell.value and "X" not in cross_cell.value:
-                continue
-            # find the corresponding name
-            if name_is_fixed_row:
-                value_position = CellPosition(value_template.row, cross_cell.column, CellPropertyType.CONTENT)
-            else:
-                value_position = CellPosition(cross_cell.row, value_template.column, CellPropertyType.CONTENT)
-            value = sheet[value_position.to_xlsx_position()].value
-            value_list.append(value)
-        return value_list
+        :param names: the names in question
+        :param sink_path: the parsed path of the cross table
+        :return: a dictionary of each name to all values that could be associated with it
+        """
+        wb = self.__workbooks.get(sink_path.file)
+        sheet = wb[sink_path.sheet]
+        is_fixed_row = sink_path.name_is_fixed_row
+        name_index = self.__name_line_index(sheet, sink_path.name_position, is_fixed_row)
+        # each line of the cross area is read once when a name asks for it -> a line which can't be read (eg. holding
+        # numbers) only fails the names pointing to it
+        tables: Dict[str, Dict[int, List[str]]] = self.__workbooks.workbook_data(wb, "cross_tables", lambda _: {})
+        read_lines = tables.setdefault(sink_path.path, {})
+        # names which can't be found are read from the line the path points to
+        cross_area = sink_path.cross_area
+        default_line = column_index_from_string(cross_area.column) if is_fixed_row else cross_area.row
+        result = {}
+        for name in names:
+            cell = name_index.get(name)
+            line = default_line if cell is None else (cell.column if is_fixed_row else cell.row)
+            if line not in read_lines:
+                read_lines[line] = self.__read_cross_line(sheet, sink_path, line)
+            result[name] = list(read_lines[line])
+        return result
+
+    def __read_cross_line(self, sheet: SheetSnapshot, sink_path: SinkPath, cross_line: int) -> List[str]:
+        """
+        Collects the values of all marked cells along the given column (or row) of the cross area
 
-    def _get_from_linear_table(self, to_find: str, value_path: str, name_path: str, nested_path: str) -> List[str]:
+        :param sheet: the sheet holding the cross table
+        :param sink_path: the parsed path of the cross table
+        :param cross_line: the index of the column (or row) of the name
+        :return: the values marked in the line
+        """
+        value_template = sink_path.value_position
+        cross_area = sink_path.cross_area
+        markers = self.__cross_markers(sheet)
+        if sink_path.name_is_fixed_row:
+            marked = [(x, cross_line) for x in markers.marked_in_column(cross_line, cross_area.row)]
+        else:
+            marked = [(cross_line, x) for x in markers.marked_in_row(cross_line,
+                                                                     column_index_from_string(cross_area.column))]
+        # find the corresponding name
+        if sink_path.value_is_fixed_row:
+            return [sheet.cell(value_template.row, column).value for _, column in marked]
+        return [sheet.cell(row, column_index_from_string(value_template.column)).value for row, _ in marked]
+
+    def _get_from_linear_table(self, names: Iterator[str], sink_path: SinkPath,
+                               nested_path: str) -> Dict[str, List[str]]:
         """
-        Returns the value(s) from the path data provided for the name given
+        Returns the value(s) from the path data provided for the names given
 
-        :param to_find: the name to get the corresponding value of
-        :param value_path: the path to the values in excel
-        :param name_path: the path to the name in excel
+        :param names: the names to get the corresponding values of
+        :param sink_path: the parsed path of the row- or column-table
         :param nested_path: the path to follow when accessing a file forwarding
-        :return: a list of values found corresponding to the name (might also be a list of one element)
+        :return: a dictionary of each name to the list of values found corresponding to it (might also be a list of
+                 one element)
         """
-        def contains_forwarding_at(to_check: List[str]) -> int:
-            """
-            Checks if the given path node lists contains a forwarding command and at which node index
-
-            :param to_check: the list of path nodes to analyse
-            :return: the index of the (first) node that contains a forwarding symbol
-            """
-            for i in range(len(to_check)):
-                if self.__config[self.FORWARDING_PATH_KEY] in to_check[i]:
-                    return i
-            return -1
-
-        def extract_value_same_sheet(work_sheet: Worksheet, value_start: CellPosition, name_start: CellPosition,
-                                     fixed_row: bool) -> str:
+        def extract_value_same_sheet(to_find: str, work_sheet: SheetSnapshot, value_start: CellPosition,
+                                     name_start: CellPosition, fixed_row: bool) -> str:
             """
             Extracts the value to the given name from the table the sheet represents
 
+            :param to_find: the name to get the corresponding value of
             :param work_sheet: the sheet to check for the name (and therefor value)
             :param value_start: the cell which indicates from where the values start
             :param name_start: the position from where the names start
             :param fixed_row: if search has to be performed column wise or row-wise (in case of false)
             :return: a list containing one entry which matches the name
             """
-            for cell in self.__get_cell_line_iterator(work_sheet, name_start, fixed_row):
-                if cell.value is None or cell.value != to_find:
-                    continue
-                if fixed_row:
-                    new_value_position = "{}{}".format(cell.column_letter, value_start.row)
-                else:
-                    new_value_position = "{}{}".format(value_start.column, cell.row)
-                value_cell = work_sheet[new_value_position]
-                if value_start.read_type == CellPropertyType.CONTENT and value_cell.value is not None:
-                    return value_cell.value
-                elif value_start.read_type == CellPropertyType.WIDTH:
-                    return str(self.__get_cell_size(work_sheet, cell))
-                else:
-                    raise AttributeError("Can't decode type: {}. Are the if-branches out-dated?".format(
-                        value_start.read_type))
-            return ""
+            cell = self.__name_line_index(work_sheet, name_start, fixed_row).get(to_find)
+            if cell is None:
+                return ""
+            if fixed_row:
+                value_cell = work_sheet.cell(value_start.row, cell.column)
+            else:
+                value_cell = work_sheet.cell(cell.row, column_index_from_string(value_start.column))
+            if value_start.read_type == CellPropertyType.CONTENT and value_cell.value is not None:
+                return value_cell.value
+            elif value_start.read_type == CellPropertyType.WIDTH:
+                return str(self.__get_cell_size(work_sheet, cell))
+            else:
+                raise AttributeError("Can't decode type: {}. Are the if-branches out-dated?".format(
+                    value_start.read_type))
 
-        def extract_value_list(work_sheet: Worksheet, value_start: CellPosition, fixed_row: bool):
+        def extract_value_list(work_sheet: SheetSnapshot, value_start: CellPosition, fixed_row: bool):
             """
             Extracts all values that can be found in the given sheet from the given position on
 
@@ -516,55 +780,160 @@ class XlsxProcessor:
                         value_start.read_type))
             return values
 
-        def extract_forward_index(forward_node: str) -> int:
-            """
-            Returns the index that is encoded in the forwarding identifier
-
-            :param forward_node: the node holding the forward identifier
-            :return: the index it holds
-            """
-            index_str = forward_node[len(self.__config[self.FORWARDING_PATH_KEY]):]
-            return int(index_str)
-
-        value_path_nodes = self.__disassemble_base_path(value_path)
-        forwarding_node_index = contains_forwarding_at(value_path_nodes)
-        if forwarding_node_index == -1:
+        sheet = self.__workbooks.get(sink_path.file)[sink_path.sheet]
+        values: Dict[str, List[str]] = {}
+        if not sink_path.is_forwarded():
             # means no forwarding is present -> all data can be found in one table
-            wb = load_workbook(value_path_nodes[0])
-            sheet = wb[value_path_nodes[1]]
-            value_position, is_fixed_row = CellPosition.from_cell_path_position(value_path)
-            name_position, _ = CellPosition.from_cell_path_position(name_path)
-            result = extract_value_same_sheet(sheet, value_position, name_position, is_fixed_row)
-            if not result:
-                # this is a real error 'cause either the name list is inhomogeneous or the path is incorrect which means
-                # the path training failed
-                raise AttributeError("Could not extract a value from {};{}".format(value_path, name_path))
-            # there can be only one value by this type of list -> wrap it in the list to comply to return value of other
-            # functions
-            return [result]
+            for name in names:
+                result = extract_value_same_sheet(name, sheet, sink_path.value_position, sink_path.name_position,
+                                                  sink_path.value_is_fixed_row)
+                if not result:
+                    # this is a real error 'cause either the name list is inhomogeneous or the path is incorrect which
+                    # means the path training failed
+                    raise AttributeError("Could not extract a value from {}".format(sink_path))
+                # there can be only one value by this type of list -> wrap it in the list to comply to return value of
+                # other functions
+                values[name] = [result]
+            return values
         else:
-            # start with tracing the name and work from there
-            name_path_nodes = self.__disassemble_base_path(name_path)
-            name_position, is_fixed_row = CellPosition.from_cell_path_position(name_path)
-            wb = load_workbook(name_path_nodes[0])
-            sheet = wb[name_path_nodes[1]]
-            forwarding_index = extract_forward_index(value_path_nodes[forwarding_node_index])
-            if is_fixed_row:
+            # start with tracing the names and work from there
+            name_position = sink_path.name_position
+            forwarding_index = sink_path.forwarding_index
+            if sink_path.name_is_fixed_row:
                 dummy_position = CellPosition(forwarding_index, name_position.column, CellPropertyType.CONTENT)
             else:
                 dummy_position = CellPosition(name_position.row, get_column_letter(forwarding_index),
                                               CellPropertyType.CONTENT)
-            # continue with extracting the values -> extract all at once -> this could also be done by returning an
-            # iterator but this is overkill in this scenario
-            file_name = extract_value_same_sheet(sheet, dummy_position, name_position, is_fixed_row)
-            if nested_path:
-                # prepend the required path if one is set
-                file_name = nested_path + file_name
-            wb = load_workbook(file_name)
-            # the sheet name of the forwarding path comes after the forwarding symbol
-            sheet = wb[value_path_nodes[forwarding_node_index + 1]]
-            value_position, is_fixed_row = CellPosition.from_cell_path_position(value_path)
-            return extract_value_list(sheet, value_position, is_fixed_row)
+            # many names forward to the same file -> read the values of each file only once
+            forwarded_values: Dict[str, List[str]] = {}
+            for name in names:
+                file_name = extract_value_same_sheet(name, sheet, dummy_position, name_position,
+                                                     sink_path.name_is_fixed_row)
+                if nested_path:
+                    # prepend the required path if one is set
+                    file_name = nested_path + file_name
+                if file_name not in forwarded_values:
+                    # continue with extracting the values -> extract all at once -> this could also be done by
+                    # returning an iterator but this is overkill in this scenario
+                    forwarded_sheet = self.__workbooks.get(file_name)[sink_path.forwarded_sheet]
+                    forwarded_values[file_name] = extract_value_list(forwarded_sheet, sink_path.value_position,
+                                                                     sink_path.value_is_fixed_row)
+                values[name] = list(forwarded_values[file_name])
+            return values
+
+    def __index_of(self, sheet: SheetSnapshot) -> SheetIndex:
+        """
+        Returns the value index of the given sheet which is only built once per parsed workbook
+
+        :param sheet: the sheet the index is wanted for
+        :return: the index of all cell contents (and widths if applicable) of the sheet
+        """
+        def build_index(to_index: SheetSnapshot) -> SheetIndex:
+            if self.__uses_width_in(to_index.title):
+                return SheetIndex(to_index, XlsxProcessor.__get_cell_color,
+                                  lambda cell: XlsxProcessor.__get_cell_size(to_index, cell))
+            return SheetIndex(to_index, XlsxProcessor.__get_cell_color)
+
+        return self.__workbooks.sheet_data(sheet, "value_index", build_index)
+
+    def __name_line_index(self, sheet: SheetSnapshot, start: CellPosition,
+                          is_fixed_row: bool) -> Dict[object, SnapshotCell]:
+        """
+        Returns the cells of the line of names starting at the given position by their content. The index is only built
+        once per parsed workbook and replaces walking the line for every name looked up
+
+        :param sheet: the sheet holding the names
+        :param start: the position of the first name
+        :param is_fixed_row: if the names are listed along a row or a column
+        :return: a dictionary of each name to the first cell holding it
+        """
+        def build_index(to_index: SheetSnapshot) -> Dict[object, SnapshotCell]:
+            index = {}
+            for cell in XlsxProcessor.__get_cell_line_iterator(to_index, start, is_fixed_row):
+                if cell.value is not None:
+                    index.setdefault(cell.value, cell)
+            return index
+
+        key = "names_{}_{}".format(start.to_xlsx_position(), "row" if is_fixed_row else "column")
+        return self.__workbooks.sheet_data(sheet, key, build_index)
+
+    def __candidate_lines(self, sheet: SheetSnapshot, value_name_pairs: Iterator[ValueNamePair],
+                          by_row: bool) -> Set[int]:
+        """
+        Returns the indexes of the rows or columns which contain at least one value or name of the pairs given. Apart
+        from the header lines all other lines can't contribute anything to a match and can be skipped
+
+        :param sheet: the sheet to get the lines from
+        :param value_name_pairs: the data to look for
+        :param by_row: set this flag to receive row indexes else column indexes are returned
+        :return: the set of line indexes as xlsx counts them
+        """
+        return self.__index_of(sheet).lines_containing(XlsxProcessor.__wanted_in(value_name_pairs), by_row)
+
+    def __holds_any_of(self, sheet: SheetSnapshot, value_name_pairs: Iterator[ValueNamePair]) -> bool:
+        """
+        Checks if any value or name of the pairs given occurs in the sheet. If not none of the table detections can
+        find anything in it. The result is counted for the statistics of get_scan_counts()
+
+        :param sheet: the sheet to check
+        :param value_name_pairs: the data to look for
+        :return: true if the sheet is worth to be scanned
+        """
+        holds_any = self.__index_of(sheet).contains_any(XlsxProcessor.__wanted_in(value_name_pairs))
+        self.__scan_counts.setdefault(sheet.title, [0, 0])[1 if holds_any else 0] += 1
+        return holds_any
+
+    @staticmethod
+    def __wanted_in(value_name_pairs: Iterator[ValueNamePair]) -> Set[str]:
+        """
+        Returns the set of all values and names of the given pairs
+        """
+        if isinstance(value_name_pairs, CellMatchingLookup):
+            value_name_pairs = value_name_pairs.pairs
+        columns = PairColumn.of(value_name_pairs)
+        wanted = set(columns.values)
+        wanted.update(columns.get_names())
+        return wanted
+
+    def __header_layout(self, sheet: SheetSnapshot, by_row: bool) -> HeaderLayout:
+        """
+        Returns the header rows or columns of the given sheet which are only detected once per parsed workbook
+
+        :param sheet: the sheet to get the header layout of
+        :param by_row: set this flag to receive the header rows else the header columns are returned
+        :return: the layout holding the scan results of all lines with a header cell as they read if none of the data
+                 looked for is in them (which makes them the same for all pairs)
+        """
+        def detect_layout(to_scan: SheetSnapshot) -> HeaderLayout:
+            color_key = "header_{}".format(to_scan.title)
+            if color_key not in self.__config:
+                raise AssertionError("Missing key '{}' for retrieving the header color".format(color_key))
+            header_color = self.__config[color_key]
+            handle_forwarding, forward_name = self.__includes_forwarding(to_scan.title)
+            forward_name = forward_name if handle_forwarding else ""
+            lines = {}
+            for index in sorted(self.__index_of(to_scan).lines_colored(header_color, by_row)):
+                line = to_scan.occupied_row(index) if by_row else to_scan.occupied_column(index)
+                lines[index] = self.__scan_cell_line_for(line, to_scan.title, to_scan, None, -1, header_color,
+                                                         forward_name)
+            return HeaderLayout(header_color, forward_name, lines)
+
+        return self.__workbooks.sheet_data(sheet, "header_rows" if by_row else "header_columns", detect_layout)
+
+    def __cross_markers(self, sheet: SheetSnapshot) -> CrossMarkers:
+        """
+        Returns the cross table markers of the given sheet which are only collected once per parsed workbook
+        """
+        return self.__workbooks.sheet_data(sheet, "cross_markers", CrossMarkers)
+
+    def __uses_width_in(self, sheet_name: str) -> bool:
+        """
+        Returns if the width of the cells is a property worth to be considered in the given sheet
+
+        :param sheet_name: the title of the sheet in question
+        :return: true if the width is to be extracted from the cells of the sheet
+        """
+        return self.WIDTH_USAGE_LIMITER not in self.__config or sheet_name in self.__config[self.WIDTH_USAGE_LIMITER]
 
     def __includes_forwarding(self, sheet_name: str) -> Tuple[bool, str]:
         """
@@ -582,7 +951,7 @@ class XlsxProcessor:
             return False, ""
         return True, names[1]
 
-    def __scan_cell_line_for(self, to_scan: Iterator[Cell], current_path: str, sheet: Worksheet,
+    def __scan_cell_line_for(self, to_scan: Iterator[SnapshotCell], current_path: str, sheet: SheetSnapshot,
                              value_name_pairs: Iterator[ValueNamePair] = None, forward_index: int = -1,
                              header_color: str = "", forward_name: str = "") -> CellPositionStruct:
         """
@@ -598,7 +967,7 @@ class XlsxProcessor:
         :param forward_name: set this value if a header field containing this value indicates forwarding
         :return: a situation dependent initialized instance of LineResultStruct
         """
-        def has_header_color(to_check: Cell) -> bool:
+        def has_header_color(to_check: SnapshotCell) -> bool:
             """
             Checks if the given cell has a background color equal to the headers background color
 
@@ -607,10 +976,12 @@ class XlsxProcessor:
             """
             return XlsxProcessor.__get_cell_color(to_check) == header_color
 
-        if value_name_pairs is None:
+        # without any pairs only headers can be detected
+        header_only = value_name_pairs is None
+        if header_only:
             value_name_pairs = []
         current_idx = 0     # which results in starting the iteration with 1 which is the start for excel
-        result_struct = CellMatchingStruct(value_name_pairs)
+        result_struct = CellMatchingStruct(value_name_pairs, header_only)
         value_position = CellPosition.create_invalid()
         name_position = CellPosition.create_invalid()
         value_path = ""
@@ -662,7 +1033,8 @@ class XlsxProcessor:
             return CellPositionStruct.create_value_found(result_struct, value_position, value_path)
         return CellPositionStruct.create_no_find()
 
-    def __extract_cell_properties(self, to_extract_from: Cell, sheet: Worksheet) -> Dict[str, CellPropertyType]:
+    def __extract_cell_properties(self, to_extract_from: SnapshotCell,
+                                  sheet: SheetSnapshot) -> Dict[str, CellPropertyType]:
         """
         Takes the cell an creates a list of properties from it
 
@@ -670,20 +1042,20 @@ class XlsxProcessor:
         :return: a list of all properties supported
         """
         to_return = {to_extract_from.value: CellPropertyType.CONTENT}
-        if self.WIDTH_USAGE_LIMITER not in self.__config or sheet.title in self.__config[self.WIDTH_USAGE_LIMITER]:
+        if self.__uses_width_in(sheet.title):
             # then add the width property
             to_return[str(self.__get_cell_size(sheet, to_extract_from))] = CellPropertyType.WIDTH
         return to_return
 
     @staticmethod
-    def __get_cell_color(cell: Cell) -> str:
+    def __get_cell_color(cell: SnapshotCell) -> str:
         """
         Returns the background color of the cell given
 
         :param cell: the cell in question
         :return: the ARGB of the cell color as string
         """
-        return cell.fill.start_color.index
+        return cell.color
 
     @staticmethod
     def __to_linear_cell_address(is_fixed_row: bool, col: str, row: int, property_identifier: CellPropertyType) -> str:
@@ -741,9 +1113,11 @@ class XlsxProcessor:
         return result.group(0)
 
     @staticmethod
-    def __get_cell_line_iterator(sheet: Worksheet, start: CellPosition, is_fixed_row: bool) -> Iterator[Cell]:
+    def __get_cell_line_iterator(sheet: SheetSnapshot, start: CellPosition,
+                                 is_fixed_row: bool) -> Iterator[SnapshotCell]:
         """
-        Returns an iterator for the cells starting from the given position in the sheet given.
+        Returns an iterator for the cells starting from the given position in the sheet given. The iteration ends with
+        the last non-empty cell of the line
 
         :param sheet: the sheet the cell line is wanted for
         :param start: the starting cell for the iteration
@@ -751,14 +1125,11 @@ class XlsxProcessor:
         :return: the cells in the given row or column
         """
         if is_fixed_row:
-            line = sheet.iter_cols(min_col=column_index_from_string(start.column), min_row=start.row, max_row=start.row)
-        else:
-            line = sheet.iter_rows(min_row=start.row, min_col=column_index_from_string(start.column),
-                                   max_col=column_index_from_string(start.column))
-        return [x[0] for x in line]
+            return sheet.occupied_row(start.row, column_index_from_string(start.column))
+        return sheet.occupied_column(column_index_from_string(start.column), start.row)
 
     @staticmethod
-    def __get_cell_size(parent: Worksheet, to_read_from: Cell) -> int:
+    def __get_cell_size(parent: SheetSnapshot, to_read_from: SnapshotCell) -> int:
         """
         Returns the size of the cell at hand in the count of columns
 
@@ -766,10 +1137,5 @@ class XlsxProcessor:
         :param to_read_from: the cell to get the size from
         :return: the size of the cell if it is merged else 1 is returned
         """
-        # courtesy goes to: https://stackoverflow.com/a/57525843
-        cell = parent.cell(to_read_from.row, to_read_from.column)
-        for merged_cells in parent.merged_cells.ranges:
-            if cell.coordinate in merged_cells:
-                # as merged cells only expand in columns
-                return merged_cells.max_col - merged_cells.min_col + 1
-        return 1
+        # the snapshot resolved the merged ranges to a span per cell already
+        return parent.merged_span(to_read_from.row, to_read_from.column)
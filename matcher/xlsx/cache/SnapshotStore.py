@@ -0,0 +1,255 @@
+from __future__ import annotations
+from typing import Dict, List, Callable
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+
+from openpyxl.worksheet.formula import ArrayFormula, DataTableFormula
+
+from matcher.xlsx.snapshot.SheetSnapshot import SheetSnapshot, WorkbookSnapshot
+
+
+class SnapshotStore:
+
+    FORMAT_VERSION = 2
+    META_FILE = "meta.json"
+    SOURCES_FILE = "sources.json"
+    ARRAY_TYPE = "i"
+    # the book keeping of the sources is shared by all threads which load files
+    __sources_lock = threading.Lock()
+
+    __directory: str
+    __parser: Callable[[str], WorkbookSnapshot]
+
+    def __init__(self, directory: str, parser: Callable[[str], WorkbookSnapshot] = WorkbookSnapshot.load):
+        """
+        The constructor
+
+        :param directory: the directory to store the snapshots in. It is created if it does not exist
+        :param parser: the function which reads a xlsx-file whose content has not been stored yet
+        """
+        self.__directory = directory
+        self.__parser = parser
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, path: str) -> WorkbookSnapshot:
+        """
+        Returns the snapshot of the given xlsx-file. If the content of the file has been snapshot before the stored
+        arrays are memory mapped else the file is parsed and the result is stored for the next time
+
+        :param path: the path to the xlsx-file
+        :return: the snapshot of the workbook
+        """
+        digest = SnapshotStore.__hash_file(path)
+        entry_dir = os.path.join(self.__directory, digest)
+        snapshot = SnapshotStore.__read(entry_dir)
+        if snapshot is None:
+            snapshot = self.__parser(path)
+            self.__write(entry_dir, snapshot, path)
+        with SnapshotStore.__sources_lock:
+            self.__register(path, digest)
+        return snapshot
+
+    def __register(self, path: str, digest: str) -> None:
+        """
+        Remembers which content the given file had the last time and drops the snapshot of its former content if no
+        other file shares it
+
+        :param path: the path to the xlsx-file
+        :param digest: the hash of its current content
+        """
+        sources_path = os.path.join(self.__directory, self.SOURCES_FILE)
+        sources: Dict[str, str] = {}
+        if os.path.exists(sources_path):
+            try:
+                with open(sources_path, "r", encoding="utf-8") as file:
+                    sources = json.load(file)
+            except ValueError:
+                # a broken book keeping only costs a few orphaned entries -> start over
+                sources = {}
+        key = os.path.normcase(os.path.abspath(path))
+        old_digest = sources.get(key)
+        if old_digest == digest:
+            return
+        sources[key] = digest
+        if old_digest is not None and old_digest not in sources.values():
+            # the source changed -> its former snapshot is stale
+            shutil.rmtree(os.path.join(self.__directory, old_digest), ignore_errors=True)
+        SnapshotStore.__write_atomic(sources_path, json.dumps(sources, indent=1).encode("utf-8"), self.__directory)
+
+    def __write(self, entry_dir: str, snapshot: WorkbookSnapshot, path: str) -> None:
+        """
+        Writes the given snapshot as one binary file of arrays per sheet plus the tables and the sheet layout in a
+        JSON file. The entry is assembled in a temporary directory which is renamed at the end so that readers never
+        encounter a half written entry
+
+        :param entry_dir: the directory to write the snapshot into
+        :param snapshot: the snapshot to store
+        :param path: the path to the xlsx-file the snapshot was read from
+        """
+        sheets = []
+        for name in snapshot.sheetnames:
+            sheet = snapshot[name]
+            try:
+                values = [SnapshotStore.__encode(x) for x in sheet.get_value_table()]
+                colors = [SnapshotStore.__encode(x) for x in sheet.get_color_table()]
+            except TypeError as error:
+                # the sheet contains content which can't be stored -> skip the persistence
+                logging.warning("The snapshot of '{}' is not stored and the file is parsed on every run: {}".format(
+                    path, error))
+                return
+            arrays = sheet.get_arrays()
+            sheets.append({"title": sheet.title, "max_row": sheet.max_row, "max_column": sheet.max_column,
+                           "values": values, "colors": colors, "lengths": [len(x) for x in arrays]})
+        temp_dir = tempfile.mkdtemp(dir=self.__directory)
+        try:
+            for i in range(len(snapshot.sheetnames)):
+                with open(os.path.join(temp_dir, "{}.bin".format(i)), "wb") as file:
+                    for to_write in snapshot[snapshot.sheetnames[i]].get_arrays():
+                        file.write(to_write)
+            meta = {"version": self.FORMAT_VERSION, "sheets": sheets}
+            with open(os.path.join(temp_dir, self.META_FILE), "w", encoding="utf-8") as file:
+                json.dump(meta, file)
+            os.rename(temp_dir, entry_dir)
+        except OSError:
+            # most likely another process stored the same content in the meantime -> use theirs
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def __read(entry_dir: str) -> WorkbookSnapshot:
+        """
+        Maps the stored snapshot in the given directory into memory
+
+        :param entry_dir: the directory holding the stored snapshot
+        :return: the snapshot or None if there's no usable entry
+        """
+        meta_path = os.path.join(entry_dir, SnapshotStore.META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        # the mapped files are closed with the snapshot (or right here if the entry turns out to be unusable)
+        mapped_files: List[mmap.mmap] = []
+        views: List[memoryview] = []
+        try:
+            with open(meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta["version"] != SnapshotStore.FORMAT_VERSION:
+                # written by another version -> drop it so that the entry can be stored anew
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                return None
+            sheets: List[SheetSnapshot] = []
+            for i in range(len(meta["sheets"])):
+                sheet_meta = meta["sheets"][i]
+                with open(os.path.join(entry_dir, "{}.bin".format(i)), "rb") as file:
+                    mapped_files.append(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+                with memoryview(mapped_files[-1]) as raw:
+                    view = raw.cast(SnapshotStore.ARRAY_TYPE)
+                views.append(view)
+                arrays = []
+                offset = 0
+                for length in sheet_meta["lengths"]:
+                    arrays.append(view[offset:offset + length])
+                    offset += length
+                views.extend(arrays)
+                if offset != len(view):
+                    raise ValueError("The arrays of sheet {} don't fill their file".format(i))
+                # the slices keep the file mapped on their own
+                view.release()
+                sheets.append(SheetSnapshot(sheet_meta["title"], sheet_meta["max_row"], sheet_meta["max_column"],
+                                            [SnapshotStore.__decode(x) for x in sheet_meta["values"]],
+                                            [SnapshotStore.__decode(x) for x in sheet_meta["colors"]], *arrays))
+            return WorkbookSnapshot(sheets, mapped_files)
+        except (OSError, ValueError, KeyError, TypeError):
+            # a damaged entry is just treated like a missing one and is overwritten
+            for view in views:
+                view.release()
+            for mapped in mapped_files:
+                mapped.close()
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+    @staticmethod
+    def __encode(value: object) -> List[object]:
+        """
+        Converts a cell content into a JSON compatible list of a type tag and the content
+        """
+        # check bool before int as it is a subclass of int
+        if isinstance(value, bool):
+            return ["b", value]
+        if isinstance(value, str):
+            return ["s", value]
+        if isinstance(value, int):
+            return ["i", value]
+        if isinstance(value, float):
+            return ["f", value]
+        # check datetime before date as it is a subclass of date
+        if isinstance(value, datetime):
+            return ["dt", value.isoformat()]
+        if isinstance(value, date):
+            return ["d", value.isoformat()]
+        if isinstance(value, time):
+            return ["t", value.isoformat()]
+        if isinstance(value, timedelta):
+            return ["td", value.total_seconds()]
+        if isinstance(value, Decimal):
+            return ["dec", str(value)]
+        # formulas are kept as the objects openpyxl represents them with
+        if isinstance(value, ArrayFormula):
+            return ["af", [value.ref, value.text]]
+        if isinstance(value, DataTableFormula):
+            return ["dtf", vars(value)]
+        raise TypeError("Can't store a cell content of type {}".format(type(value)))
+
+    @staticmethod
+    def __decode(encoded: List[object]) -> object:
+        """
+        Converts the list created by __encode back into the cell content
+        """
+        tag, value = encoded
+        if tag in ["b", "s", "i", "f"]:
+            return value
+        if tag == "dt":
+            return datetime.fromisoformat(value)
+        if tag == "d":
+            return date.fromisoformat(value)
+        if tag == "t":
+            return time.fromisoformat(value)
+        if tag == "td":
+            return timedelta(seconds=value)
+        if tag == "dec":
+            return Decimal(value)
+        if tag == "af":
+            return ArrayFormula(*value)
+        if tag == "dtf":
+            return DataTableFormula(**value)
+        raise TypeError("Unknown type tag: {}".format(tag))
+
+    @staticmethod
+    def __hash_file(path: str) -> str:
+        """
+        Hashes the content of the given file
+
+        :param path: the file to hash
+        :return: the hex digest of the content
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def __write_atomic(path: str, content: bytes, temp_dir: str) -> None:
+        """
+        Writes the content to a temporary file first and replaces the target with it afterwards
+        """
+        handle, temp_path = tempfile.mkstemp(dir=temp_dir)
+        with os.fdopen(handle, "wb") as file:
+            file.write(content)
+        os.replace(temp_path, path)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+from typing import Tuple, Dict, Callable, Any, Iterator
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+import os
+
+from matcher.xlsx.snapshot.SheetSnapshot import WorkbookSnapshot, SheetSnapshot
+
+
+class WorkbookCache:
+
+    class _Entry:
+        """
+        Works as a container for one parsed workbook and the file state it was parsed from
+        """
+        workbook: WorkbookSnapshot
+        file_state: Tuple[int, int]
+        size: int
+        sheet_data: Dict[Tuple[str, str], Any]
+        workbook_data: Dict[str, Any]
+
+        def __init__(self, workbook: WorkbookSnapshot, file_state: Tuple[int, int]):
+            self.workbook = workbook
+            self.file_state = file_state
+            self.size = workbook.get_nbytes()
+            self.sheet_data = {}
+            self.workbook_data = {}
+
+    __entries: OrderedDict
+    __owners: Dict[int, _Entry]
+    __max_entries: int
+    __max_bytes: int
+    __current_bytes: int
+    __loader: Callable[[str], WorkbookSnapshot]
+    __prefetcher: ThreadPoolExecutor
+    __pending: Dict[str, Future]
+    hits: int
+    misses: int
+    prefetched: int
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0,
+                 loader: Callable[[str], WorkbookSnapshot] = WorkbookSnapshot.load):
+        """
+        The constructor
+
+        :param max_entries: the maximum number of workbooks to keep parsed (0 means no limit)
+        :param max_bytes: the maximum accumulated size of all workbook snapshots kept in memory (0 means no limit)
+        :param loader: the function which creates the snapshot of a xlsx-file when it is not cached
+        """
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("The limits of the cache can't be negative: {} entries and {} bytes".format(max_entries,
+                                                                                                       max_bytes))
+        self.__entries = OrderedDict()
+        self.__owners = {}
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__current_bytes = 0
+        self.__loader = loader
+        self.__prefetcher = None
+        self.__pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, path: str) -> bool:
+        return self.__to_key(path) in self.__entries
+
+    def clone_empty(self) -> WorkbookCache:
+        """
+        Creates a new and empty cache with the same limits and the same loader as this one
+
+        :return: the new cache
+        """
+        return WorkbookCache(self.__max_entries, self.__max_bytes, self.__loader)
+
+    def get(self, path: str) -> WorkbookSnapshot:
+        """
+        Returns the snapshot of the workbook for the file given. The file is only parsed if it is not cached yet or if
+        it has been changed on disk since it was parsed the last time
+
+        :param path: the path to the xlsx-file
+        :return: the snapshot which represents the file
+        """
+        key = self.__to_key(path)
+        file_state = self.__read_file_state(path)
+        entry: WorkbookCache._Entry = self.__entries.get(key)
+        if entry is not None and entry.file_state == file_state:
+            # mark the entry as the most recently used one
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry.workbook
+        if entry is not None:
+            # the file has been changed on disk -> the parsed data is outdated
+            self.__remove(key)
+        self.misses += 1
+        workbook = self.__take_prefetched(key, file_state)
+        if workbook is None:
+            workbook = self.__loader(path)
+        entry = WorkbookCache._Entry(workbook, file_state)
+        self.__entries[key] = entry
+        self.__owners[id(entry.workbook)] = entry
+        self.__current_bytes += entry.size
+        self.__evict()
+        return entry.workbook
+
+    def prefetch(self, paths: Iterator[str], workers: int) -> None:
+        """
+        Starts to load the given files in background threads. A later call of get() for one of these files only
+        blocks if the file is not loaded yet
+
+        :param paths: the paths to the xlsx-files to load
+        :param workers: the maximum number of threads loading files at the same time
+        """
+        if self.__prefetcher is None:
+            self.__prefetcher = ThreadPoolExecutor(workers, thread_name_prefix="workbook-prefetch")
+        for path in paths:
+            key = self.__to_key(path)
+            if key in self.__entries or key in self.__pending:
+                continue
+            self.__pending[key] = self.__prefetcher.submit(self.__load_in_background, path)
+
+    def close(self) -> None:
+        """
+        Stops the background loading: pending loads which haven't started yet are dropped while the ones already
+        running are finished and can still be received with get()
+        """
+        for pending in self.__pending.values():
+            pending.cancel()
+        if self.__prefetcher is not None:
+            self.__prefetcher.shutdown(wait=True)
+            self.__prefetcher = None
+        self.__pending = {x: y for x, y in self.__pending.items() if not y.cancelled()}
+
+    def sheet_data(self, sheet: SheetSnapshot, key: str, factory: Callable[[SheetSnapshot], Any]) -> Any:
+        """
+        Returns data derived from the given sheet which is created only once per parsed workbook. The data lives as
+        long as the workbook stays in the cache and is dropped with it. If the sheet does not belong to a cached
+        workbook the data is created on every call
+
+        :param sheet: the sheet the data is derived from
+        :param key: the name under which the kind of data is stored
+        :param factory: the function which derives the data from the sheet
+        :return: the data derived from the sheet
+        """
+        entry = self.__owners.get(id(sheet.parent))
+        if entry is None or entry.workbook is not sheet.parent:
+            return factory(sheet)
+        data_key = (sheet.title, key)
+        if data_key not in entry.sheet_data:
+            entry.sheet_data[data_key] = factory(sheet)
+        return entry.sheet_data[data_key]
+
+    def workbook_data(self, workbook: WorkbookSnapshot, key: str, factory: Callable[[WorkbookSnapshot], Any]) -> Any:
+        """
+        Works like sheet_data but for data which belongs to the whole workbook
+
+        :param workbook: the workbook the data is derived from
+        :param key: the name under which the kind of data is stored
+        :param factory: the function which creates the data for the workbook
+        :return: the data belonging to the workbook
+        """
+        entry = self.__owners.get(id(workbook))
+        if entry is None or entry.workbook is not workbook:
+            return factory(workbook)
+        if key not in entry.workbook_data:
+            entry.workbook_data[key] = factory(workbook)
+        return entry.workbook_data[key]
+
+    def invalidate(self, path: str = "") -> None:
+        """
+        Drops the workbook of the given file from the cache. If no path is given the whole cache is cleared
+
+        :param path: the path to the file to drop
+        """
+        if not path:
+            for entry in self.__entries.values():
+                entry.workbook.close()
+            self.__entries.clear()
+            self.__owners.clear()
+            self.__current_bytes = 0
+            for pending in self.__pending.values():
+                pending.cancel()
+            self.__pending.clear()
+            return
+        key = self.__to_key(path)
+        if key in self.__pending:
+            self.__pending.pop(key).cancel()
+        if key in self.__entries:
+            self.__remove(key)
+
+    def __load_in_background(self, path: str) -> Tuple[Tuple[int, int], WorkbookSnapshot]:
+        """
+        Loads the given file inside a prefetch thread
+
+        :param path: the path to the xlsx-file
+        :return: a tuple of the state the file was in before it was loaded and its snapshot
+        """
+        file_state = self.__read_file_state(path)
+        return file_state, self.__loader(path)
+
+    def __take_prefetched(self, key: str, file_state: Tuple[int, int]) -> WorkbookSnapshot:
+        """
+        Returns the snapshot loaded in background for the given key. Waits for the load if it is still in progress
+
+        :param key: the (normalized) key of the file
+        :param file_state: the state the file is in now
+        :return: the snapshot or None if the file was not prefetched, its load failed or the file changed since
+        """
+        pending = self.__pending.pop(key, None)
+        if pending is None or pending.cancelled():
+            return None
+        try:
+            prefetched_state, workbook = pending.result()
+        except Exception:
+            # let the regular load raise the error in the thread of the caller
+            return None
+        if prefetched_state != file_state:
+            workbook.close()
+            return None
+        self.prefetched += 1
+        return workbook
+
+    def __remove(self, key: str) -> None:
+        """
+        Removes the entry under the given key and keeps the book keeping of the size up to date. The files the
+        snapshot of the entry is mapped from are closed
+
+        :param key: the (normalized) key of the entry
+        """
+        entry = self.__entries.pop(key)
+        del self.__owners[id(entry.workbook)]
+        self.__current_bytes -= entry.size
+        entry.workbook.close()
+
+    def __evict(self) -> None:
+        """
+        Drops the least recently used entries until the limits of the cache are satisfied again. The most recent entry
+        is always kept as it is the one the caller is about to work with
+        """
+        while len(self.__entries) > 1:
+            too_many = 0 < self.__max_entries < len(self.__entries)
+            too_large = 0 < self.__max_bytes < self.__current_bytes
+            if not too_many and not too_large:
+                return
+            self.__remove(next(iter(self.__entries)))
+
+    @staticmethod
+    def __to_key(path: str) -> str:
+        """
+        Normalizes the given path so that different notations of the same file share one entry
+        """
+        return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def __read_file_state(path: str) -> Tuple[int, int]:
+        """
+        Returns the modification time and the size of the file which both identify the state the file is in
+
+        :param path: the file to check
+        :return: a tuple of the modification time in nanoseconds and the file size in bytes
+        """
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
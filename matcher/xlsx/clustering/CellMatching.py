@@ -1,7 +1,9 @@
+from __future__ import annotations
 from enum import IntEnum
-from typing import List, Iterator
+from typing import List, Iterator, Dict, Tuple
 
 from matcher.clustering.ValueNamePair import ValueNamePair
+from matcher.clustering.PairColumn import PairColumn
 
 
 class CellMatchResult(IntEnum):
@@ -11,24 +13,88 @@ class CellMatchResult(IntEnum):
     VALUE_FOUND = 3
 
 
+class CellMatchingLookup:
+    pairs: PairColumn
+    __value_indexes: Dict[str, int]
+    __name_indexes: Dict[str, int]
+    __first_ambiguous: int
+
+    def __init__(self, value_name_pairs: Iterator[ValueNamePair]):
+        """
+        The constructor which hashes the values and names of the given pairs so that a cell value can be tested against
+        all of them at once. As the pairs were tested in order before only the first occurrence of a value or name is
+        registered
+
+        :param value_name_pairs: A list of values pairs with there root node name or their columns
+        """
+        self.pairs = PairColumn.of(value_name_pairs)
+        self.__value_indexes = {}
+        self.__name_indexes = {}
+        self.__first_ambiguous = len(self.pairs)
+        values = self.pairs.values
+        names = self.pairs.names
+        for i in range(len(self.pairs)):
+            if values[i] == names[i] and self.__first_ambiguous == len(self.pairs):
+                self.__first_ambiguous = i
+            self.__value_indexes.setdefault(values[i], i)
+            self.__name_indexes.setdefault(names[i], i)
+
+    def __iter__(self):
+        return iter(self.pairs)
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def find(self, value: str) -> Tuple[CellMatchResult, str]:
+        """
+        Looks up the first pair whose value or name equals the given value
+
+        :param value: the value to look up
+        :return: if the value matched a value or a name of a pair along with the other part of the pair
+        """
+        value_index = self.__value_indexes.get(value, len(self.pairs))
+        name_index = self.__name_indexes.get(value, len(self.pairs))
+        first_index = min(value_index, name_index)
+        if first_index >= self.__first_ambiguous:
+            # either nothing matched or a pair with the same value and name comes first: then there's no way of telling
+            # if it is the name or the value which will hit -> just abort
+            return CellMatchResult.NO_FINDING, ""
+        if value_index == first_index:
+            return CellMatchResult.VALUE_FOUND, self.pairs.names[first_index]
+        return CellMatchResult.NAME_FOUND, self.pairs.values[first_index]
+
+    @staticmethod
+    def of(value_name_pairs: Iterator[ValueNamePair]) -> CellMatchingLookup:
+        """
+        Returns the given pairs as lookup. If a lookup is given it is returned as it is so that it can be shared
+
+        :param value_name_pairs: either a list of value-name pairs, their columns or an existing lookup
+        :return: a lookup over the given pairs
+        """
+        if isinstance(value_name_pairs, CellMatchingLookup):
+            return value_name_pairs
+        return CellMatchingLookup(value_name_pairs)
+
+
 class CellMatchingStruct:
     success_type: CellMatchResult
     __expected: str
-    __pool: List[ValueNamePair]
+    __lookup: CellMatchingLookup
 
     def __init__(self, value_name_pairs: Iterator[ValueNamePair], skip_validation: bool = False):
         """
         The constructor
 
-        :param value_name_pairs: A list of values pairs with there root node name
+        :param value_name_pairs: A list of values pairs with there root node name or a lookup which is shared between
+                                 multiple instances
         :param skip_validation: set this flag if the test for the constructors data shall be disabled
         """
         self.success_type = CellMatchResult.NO_FINDING
         self.__expected = ""
-        self.__pool = list(value_name_pairs)
+        self.__lookup = CellMatchingLookup.of(value_name_pairs)
         if skip_validation:
             return
-        if len(self.__pool) < 1:
+        if len(self.__lookup) < 1:
             raise AttributeError("Can't be initialized with an empty list")
 
     def test_value(self, value: str) -> CellMatchResult:
@@ -41,22 +107,14 @@ class CellMatchingStruct:
         if value == "":
             return CellMatchResult.NO_FINDING
         if self.success_type is CellMatchResult.NO_FINDING:
-            for entry in self.__pool:
-                # check if the value is **in** the value rather then for equality for higher flexibility
-                # -> if types can be distinguished (by extracting them from eg. the XML-Schema) it would make more sense
-                # to check numerical values vor equality or double values for a certain count of digits
-                if entry.value == entry.name:
-                    # there's no way of telling if it is the name or the value which will hit -> just abort
-                    return CellMatchResult.NO_FINDING
-                elif entry.value == value:
-                    self.__expected = entry.name
-                    self.success_type = CellMatchResult.VALUE_FOUND
-                    return self.success_type
-                elif entry.name == value:
-                    self.__expected = entry.value
-                    self.success_type = CellMatchResult.NAME_FOUND
-                    return self.success_type
-            return CellMatchResult.NO_FINDING
+            # -> if types can be distinguished (by extracting them from eg. the XML-Schema) it would make more sense
+            # to check numerical values vor equality or double values for a certain count of digits
+            result, counterpart = self.__lookup.find(value)
+            if result == CellMatchResult.NO_FINDING:
+                return result
+            self.__expected = counterpart
+            self.success_type = result
+            return self.success_type
         if self.success_type.value > 1:
             # an empty value is an invalid value
             if self.__expected == "":
@@ -77,7 +135,7 @@ class CellMatchingStruct:
 
         :return: a list of tuple which represent value-name pairs
         """
-        return list(self.__pool)
+        return list(self.__lookup.pairs)
 
     def get_missing_entry(self) -> str:
         """
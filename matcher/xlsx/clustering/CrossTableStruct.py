@@ -1,10 +1,12 @@
 from __future__ import annotations
-from typing import List, Iterator, Tuple
-from openpyxl.cell import Cell
+from typing import List, Iterator, Tuple, Dict
+from collections import Counter
 from enum import Enum
 
 from matcher.clustering.ValueNamePair import ValueNamePair
+from matcher.clustering.PairColumn import PairColumn
 from matcher.xlsx.location.CellPositioning import CellPosition
+from matcher.xlsx.snapshot.SheetSnapshot import SnapshotCell
 
 
 class CrossTableStruct:
@@ -31,7 +33,7 @@ class CrossTableStruct:
         self.first_find = CellPosition.create_invalid()
         self.opposite_find = CellPosition.create_invalid()
 
-    def find_other_pair_values_in(self, to_check: Iterator[Cell]) -> bool:
+    def find_other_pair_values_in(self, to_check: Iterator[SnapshotCell]) -> bool:
         """
         Checks if the given cell collection contains enough samples of from either the values list or the name list
         depending on what was found with the call of values_exist_in()
@@ -41,18 +43,21 @@ class CrossTableStruct:
         """
         if not self.__opposite_list:
             return False
-        work = list(self.__opposite_list)
+        # count the entries still missing per entry instead of removing them from a list copy
+        work = Counter(self.__opposite_list)
+        missing = len(self.__opposite_list)
         for cell in to_check:
-            if cell.value in work:
-                work.remove(cell.value)
+            if work.get(cell.value, 0) > 0:
+                work[cell.value] -= 1
+                missing -= 1
                 # housekeeping
                 if cell.value == self.__opposite_value:
                     self.opposite_find = CellPosition.create_from(cell)
-        if len(work) <= (1 - self.REQUIRED_SUCCESS_RATE) * len(self.__opposite_list):
+        if missing <= (1 - self.REQUIRED_SUCCESS_RATE) * len(self.__opposite_list):
             return True
         return False
 
-    def contains_counterpart(self, to_check: Cell) -> bool:
+    def contains_counterpart(self, to_check: SnapshotCell) -> bool:
         """
         Returns true if the given cell contains the expected value to match the first hit with the call to
         values_exist_in()
@@ -89,16 +94,24 @@ class CrossTableStruct:
         return self.__first_position_is_value
 
     @staticmethod
-    def values_exist_in(to_scan: Iterator[Cell], to_find: Iterator[ValueNamePair]) -> Tuple[bool, CrossTableStruct]:
+    def values_exist_in(to_scan: Iterator[SnapshotCell],
+                        to_find: Iterator[ValueNamePair]) -> Tuple[bool, CrossTableStruct]:
         """
         Initializes the struct in a working state and returns it along with an indicator if continuing assuming a
         cross table with the expected data makes sense
 
         :param to_scan: the cell-line to check for the expected value-name pairs
-        :param to_find: the expected data
+        :param to_find: the expected data as value-name pairs or their columns
         :return: a tuple if enough entries could be found and if so a struct which holds the required data to continue
         """
-        values, names = ValueNamePair.unzip(to_find)
+        columns = PairColumn.of(to_find)
+        values, names = columns.values, columns.get_names()
+        # the indexes of each value and name -> a cell is looked up once instead of being compared with every pair
+        value_indexes: Dict[str, List[int]] = {}
+        name_indexes: Dict[str, List[int]] = {}
+        for i in range(len(values)):
+            value_indexes.setdefault(values[i], []).append(i)
+            name_indexes.setdefault(names[i], []).append(i)
         # a set only allows unique entries -> finding the same value multiple time will therefor yield only one entry
         found_indices = set()
         read_state = CrossTableStruct.FindingState.NO_FIND
@@ -106,27 +119,28 @@ class CrossTableStruct:
         for cell in to_scan:
             if cell.value is None:
                 continue
-            for i in range(len(values)):
-                if cell.value == values[i] and read_state == CrossTableStruct.FindingState.NO_FIND:
-                    # this branch should only be reached once so set all struct members possible to set
+            value_hits = value_indexes.get(cell.value, [])
+            name_hits = name_indexes.get(cell.value, [])
+            if read_state == CrossTableStruct.FindingState.NO_FIND and (value_hits or name_hits):
+                # the first pair the cell belongs to decides -> its value wins if the cell is the value and the name
+                if value_hits and (not name_hits or value_hits[0] <= name_hits[0]):
+                    i = value_hits[0]
                     result_container.__opposite_value = names[i]
                     result_container.__opposite_list = names
                     result_container.__first_position_is_value = True
-                    result_container.first_find = CellPosition.create_from(cell)
-                    found_indices.add(i)
                     read_state = CrossTableStruct.FindingState.VALUE_FOUND
-                elif cell.value == values[i] and read_state == CrossTableStruct.FindingState.VALUE_FOUND:
-                    # only do the book keeping
-                    found_indices.add(i)
-                elif cell.value == names[i] and read_state == CrossTableStruct.FindingState.NO_FIND:
+                else:
+                    i = name_hits[0]
                     result_container.__opposite_value = values[i]
                     result_container.__opposite_list = values
                     result_container.__first_position_is_value = False
-                    result_container.first_find = CellPosition.create_from(cell)
-                    found_indices.add(i)
                     read_state = CrossTableStruct.FindingState.NAME_FOUND
-                elif cell.value == names[i] and read_state == CrossTableStruct.FindingState.NAME_FOUND:
-                    found_indices.add(i)
+                result_container.first_find = CellPosition.create_from(cell)
+            # only do the book keeping
+            if read_state == CrossTableStruct.FindingState.VALUE_FOUND:
+                found_indices.update(value_hits)
+            elif read_state == CrossTableStruct.FindingState.NAME_FOUND:
+                found_indices.update(name_hits)
         # perform the "post-processing"
         if not result_container.__opposite_value:
             # value has not been set -> so no data found -> abort and return an empty struct
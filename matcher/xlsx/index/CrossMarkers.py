@@ -0,0 +1,109 @@
+from typing import List
+
+from matcher.xlsx.snapshot.SheetSnapshot import SheetSnapshot
+
+
+class CrossMarkers:
+    """
+    Holds the cells of a sheet which mark an association in a cross table as bit sets: one integer per row with a bit
+    per column and one integer per column with a bit per row
+    """
+
+    __max_row: int
+    __max_column: int
+    # the count of cells which are exactly a "x" or "X" in the row given and all rows below it
+    __marks_from: List[int]
+    # the cells with a text containing a "x" or "X"
+    __row_bits: List[int]
+    __column_bits: List[int]
+    # the cells with a content which is not a text
+    __foreign_row_bits: List[int]
+    __foreign_column_bits: List[int]
+
+    def __init__(self, sheet: SheetSnapshot):
+        """
+        The constructor which classifies the content of the sheet once
+
+        :param sheet: the sheet to read the markers from
+        """
+        self.__max_row = sheet.max_row
+        self.__max_column = sheet.max_column
+        values = sheet.get_value_table()
+        # classify each unique content only once -> the cells just point to them
+        exact = {i for i, value in enumerate(values) if value == "x" or value == "X"}
+        marking = {i for i, value in enumerate(values) if isinstance(value, str) and ("x" in value or "X" in value)}
+        foreign = {i for i, value in enumerate(values) if not isinstance(value, str)}
+        marks_per_row = [0] * (self.__max_row + 2)
+        self.__row_bits = [0] * (self.__max_row + 1)
+        self.__column_bits = [0] * (self.__max_column + 1)
+        self.__foreign_row_bits = [0] * (self.__max_row + 1)
+        self.__foreign_column_bits = [0] * (self.__max_column + 1)
+        value_ids = sheet.get_arrays()[0]
+        for offset in range(len(value_ids)):
+            value_id = value_ids[offset]
+            if value_id == SheetSnapshot.EMPTY:
+                continue
+            row = offset // self.__max_column + 1
+            column = offset % self.__max_column + 1
+            if value_id in exact:
+                marks_per_row[row] += 1
+            if value_id in marking:
+                self.__row_bits[row] |= 1 << (column - 1)
+                self.__column_bits[column] |= 1 << (row - 1)
+            elif value_id in foreign:
+                self.__foreign_row_bits[row] |= 1 << (column - 1)
+                self.__foreign_column_bits[column] |= 1 << (row - 1)
+        self.__marks_from = [0] * (self.__max_row + 2)
+        for row in range(self.__max_row, 0, -1):
+            self.__marks_from[row] = self.__marks_from[row + 1] + marks_per_row[row]
+
+    def count_from(self, row: int) -> int:
+        """
+        Returns the count of cells being exactly a "x" or "X" in the given row and all rows below it
+
+        :param row: the row index to start counting at as xlsx counts them
+        :return: the count of markers
+        """
+        if row > self.__max_row:
+            return 0
+        return self.__marks_from[max(row, 1)]
+
+    def marked_in_row(self, row: int, min_col: int = 1) -> List[int]:
+        """
+        Returns the columns of the cells in the given row whose text contains a "x" or "X"
+
+        :param row: the row index as xlsx counts them
+        :param min_col: the column index to start with
+        :return: the ascending column indexes as xlsx counts them
+        """
+        if not 1 <= row <= self.__max_row:
+            return []
+        return CrossMarkers.__select(self.__row_bits[row], self.__foreign_row_bits[row], min_col)
+
+    def marked_in_column(self, column: int, min_row: int = 1) -> List[int]:
+        """
+        Returns the rows of the cells in the given column whose text contains a "x" or "X"
+
+        :param column: the column index as xlsx counts them
+        :param min_row: the row index to start with
+        :return: the ascending row indexes as xlsx counts them
+        """
+        if not 1 <= column <= self.__max_column:
+            return []
+        return CrossMarkers.__select(self.__column_bits[column], self.__foreign_column_bits[column], min_row)
+
+    @staticmethod
+    def __select(bits: int, foreign_bits: int, start: int) -> List[int]:
+        """
+        Returns the indexes (as xlsx counts them) of the bits set from the given index onwards
+        """
+        skipped = max(start, 1) - 1
+        if foreign_bits >> skipped:
+            raise TypeError("Can't check a cell content which is not a text for a cross table marker")
+        bits >>= skipped
+        indexes = []
+        while bits:
+            lowest = bits & -bits
+            indexes.append(skipped + lowest.bit_length())
+            bits ^= lowest
+        return indexes
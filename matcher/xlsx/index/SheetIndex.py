@@ -0,0 +1,85 @@
+from typing import Dict, List, Tuple, Iterator, Callable, Set
+
+from matcher.xlsx.snapshot.SheetSnapshot import SnapshotCell, SheetSnapshot
+
+
+class SheetIndex:
+
+    __positions: Dict[object, List[Tuple[int, int]]]
+    __colored: Dict[str, List[Tuple[int, int]]]
+
+    def __init__(self, sheet: SheetSnapshot, color_of: Callable[[SnapshotCell], str],
+                 width_of: Callable[[SnapshotCell], int] = None):
+        """
+        The constructor which reads the whole sheet once and registers the position of every non-empty cell under its
+        value and its background color
+
+        :param sheet: the sheet to index
+        :param color_of: the function which returns the background color of a cell
+        :param width_of: set this function if the width of the cells shall be indexed as well
+        """
+        self.__positions = {}
+        self.__colored = {}
+        min_row, min_column, max_row, _ = sheet.get_used_range()
+        for row_index in range(min_row, max_row + 1):
+            for cell in sheet.occupied_row(row_index, min_column):
+                if cell.value is None:
+                    continue
+                position = (cell.row, cell.column)
+                self.__positions.setdefault(cell.value, []).append(position)
+                if width_of is not None:
+                    width = str(width_of(cell))
+                    # a cell whose content equals its width is still only one candidate
+                    if width != cell.value:
+                        self.__positions.setdefault(width, []).append(position)
+                self.__colored.setdefault(color_of(cell), []).append(position)
+
+    def positions_of(self, value: object) -> List[Tuple[int, int]]:
+        """
+        Returns the positions of all cells that hold the given value either as content or as width
+
+        :param value: the value to look up
+        :return: a list of row-column-tuples (as xlsx counts them) in the order they appear row by row
+        """
+        return list(self.__positions.get(value, []))
+
+    def contains_any(self, values: Iterator[object]) -> bool:
+        """
+        Returns if at least one of the given values is held by any cell as content or as width
+
+        :param values: the values to look up
+        :return: true if one of the values occurs in the sheet else false
+        """
+        return any(value in self.__positions for value in values)
+
+    def lines_containing(self, values: Iterator[object], by_row: bool) -> Set[int]:
+        """
+        Returns the indexes of the rows (or columns) which hold at least one of the values given
+
+        :param values: the values to look up
+        :param by_row: set this flag to receive row indexes else column indexes are returned
+        :return: the set of line indexes as xlsx counts them
+        """
+        lines = set()
+        for value in values:
+            lines.update(SheetIndex.__select(self.__positions.get(value, []), by_row))
+        return lines
+
+    def lines_colored(self, color: str, by_row: bool) -> Set[int]:
+        """
+        Returns the indexes of the rows (or columns) which hold at least one non-empty cell of the given background
+        color
+
+        :param color: the ARGB of the background color
+        :param by_row: set this flag to receive row indexes else column indexes are returned
+        :return: the set of line indexes as xlsx counts them
+        """
+        return set(SheetIndex.__select(self.__colored.get(color, []), by_row))
+
+    @staticmethod
+    def __select(positions: List[Tuple[int, int]], by_row: bool) -> Iterator[int]:
+        """
+        Picks the row or the column index of the positions given
+        """
+        index = 0 if by_row else 1
+        return (position[index] for position in positions)
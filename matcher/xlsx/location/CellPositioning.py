@@ -1,11 +1,12 @@
 from __future__ import annotations
-from openpyxl.cell.cell import Cell
 from openpyxl.utils import column_index_from_string, get_column_letter
 from enum import IntEnum
 from typing import Tuple
+import copy
 import re
 
 from matcher.enum.CellPropertyType import CellPropertyType
+from matcher.xlsx.snapshot.SheetSnapshot import SnapshotCell
 from matcher.xlsx.clustering.CellMatching import CellMatchingStruct
 
 
@@ -69,9 +70,9 @@ class CellPosition:
         return "{}{}".format(self.column, self.row)
 
     @staticmethod
-    def create_from(cell: Cell, cell_property: CellPropertyType = CellPropertyType.CONTENT) -> CellPosition:
+    def create_from(cell: SnapshotCell, cell_property: CellPropertyType = CellPropertyType.CONTENT) -> CellPosition:
         """
-        A factory method to create an instance from a openpyxl.Cell instance
+        A factory method to create an instance from a cell of a sheet snapshot
 
         :param cell: the cell to take the "coordinates" from
         :param cell_property: the property to get the content the instance is addressing (defaults to the cells value)
@@ -182,6 +183,15 @@ class CellPositionStruct:
         return CellPositionStruct(CellPositionStructType.DATA_FOUND, match_result, value_position,
                                   CellPosition.create_invalid(), value_path)
 
+    def copy(self) -> CellPositionStruct:
+        """
+        Creates a copy of the struct which can be altered without affecting this instance
+
+        :return: the copy
+        """
+        return CellPositionStruct(self.read_result, copy.copy(self.match_struct), copy.copy(self.value_position),
+                                  copy.copy(self.name_or_forward_position), self.value_path)
+
     def contains_header_forwarding_position(self) -> bool:
         """
         Answers if the struct represents a header which holds a valid position for a header row or column
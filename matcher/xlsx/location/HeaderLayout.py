@@ -0,0 +1,64 @@
+from __future__ import annotations
+from typing import Dict, Set, List
+
+from matcher.xlsx.location.CellPositioning import CellPosition, CellPositionStruct
+
+
+class HeaderLayout:
+    """
+    Holds the header lines of a sheet in one orientation (rows or columns) as they read without any data of interest in
+    them. As the layout of a sheet doesn't change during a run it only needs to be detected once per sheet
+    """
+
+    header_color: str
+    forward_name: str
+    first_line: int
+    __lines: Dict[int, CellPositionStruct]
+
+    def __init__(self, header_color: str, forward_name: str, lines: Dict[int, CellPositionStruct]):
+        """
+        The constructor
+
+        :param header_color: the ARGB of the background color which marks header cells
+        :param forward_name: the content of the header cell which marks forwarding (empty if there's no forwarding)
+        :param lines: the line index (as xlsx counts them) of every header line mapped to the result of its scan
+        """
+        self.header_color = header_color
+        self.forward_name = forward_name
+        self.first_line = min(lines.keys(), default=-1)
+        self.__lines = lines
+
+    def result_of(self, line: int) -> CellPositionStruct:
+        """
+        Returns the result of scanning the given header line without any data to look for
+
+        :param line: the index of the line as xlsx counts them
+        :return: the struct describing the header (and the forwarding position if the line holds one)
+        """
+        return self.__lines[line]
+
+    def forward_positions(self) -> List[CellPosition]:
+        """
+        Returns the positions of the header cells which mark forwarding in the order of their lines
+        """
+        return [x.name_or_forward_position for x in self.__lines.values() if x.contains_header_forwarding_position()]
+
+    def has_header(self) -> bool:
+        """
+        Returns if any header line has been found. Without one no data pair can be assigned
+        """
+        return self.first_line > 0
+
+    def lines_from(self, candidates: Set[int], from_first_header: bool) -> Set[int]:
+        """
+        Merges the given candidate lines with the header lines
+
+        :param candidates: the lines which hold data of interest
+        :param from_first_header: set this flag to drop the candidates in front of the first header line as these can
+                                  not contribute to a data pair
+        :return: the set of lines which need to be visited
+        """
+        lines = candidates.union(self.__lines.keys())
+        if from_first_header:
+            return {x for x in lines if x >= self.first_line}
+        return lines
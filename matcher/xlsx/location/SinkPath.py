@@ -0,0 +1,150 @@
+from __future__ import annotations
+from enum import IntEnum
+from typing import Dict
+
+from matcher.xlsx.location.CellPositioning import CellPosition
+
+
+class SinkPathType(IntEnum):
+    LINEAR_TABLE = 0
+    CROSS_TABLE = 1
+
+
+class SinkPath:
+    """
+    Holds a trained path into the xlsx-files in its parsed form so that the values of many names can be read with it
+    without interpreting the path string again
+    """
+
+    path: str
+    table_type: SinkPathType
+    file: str
+    sheet: str
+    value_position: CellPosition
+    value_is_fixed_row: bool
+    name_position: CellPosition
+    name_is_fixed_row: bool
+    # the area of the markers if the path addresses a cross table
+    cross_area: CellPosition
+    # the index of the row or column holding the file names if the values are forwarded to other files (else -1)
+    forwarding_index: int
+    forwarded_sheet: str
+
+    def __init__(self, path: str, table_type: SinkPathType, file: str, sheet: str, value_position: CellPosition,
+                 value_is_fixed_row: bool, name_position: CellPosition, name_is_fixed_row: bool):
+        """
+        The constructor which is discouraged to be used outside of the static factory methods
+
+        :param path: the path the instance was parsed from
+        :param table_type: the kind of table the path addresses
+        :param file: the xlsx-file holding the names
+        :param sheet: the sheet holding the names
+        :param value_position: the position the values start at
+        :param value_is_fixed_row: if the values are read along a row
+        :param name_position: the position the names start at
+        :param name_is_fixed_row: if the names are read along a row
+        """
+        self.path = path
+        self.table_type = table_type
+        self.file = file
+        self.sheet = sheet
+        self.value_position = value_position
+        self.value_is_fixed_row = value_is_fixed_row
+        self.name_position = name_position
+        self.name_is_fixed_row = name_is_fixed_row
+        self.cross_area = CellPosition.create_invalid()
+        self.forwarding_index = -1
+        self.forwarded_sheet = ""
+
+    def __str__(self):
+        return self.path
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Returns the parsed parts of the path in a JSON compatible form
+        """
+        to_return = {
+            "path": self.path,
+            "table_type": self.table_type.name,
+            "file": self.file,
+            "sheet": self.sheet,
+            "value_position": "{}:{}".format(self.value_position, self.value_position.read_type),
+            "value_is_fixed_row": self.value_is_fixed_row,
+            "name_position": str(self.name_position),
+            "name_is_fixed_row": self.name_is_fixed_row
+        }
+        if self.table_type == SinkPathType.CROSS_TABLE:
+            to_return["cross_area"] = str(self.cross_area)
+        if self.is_forwarded():
+            to_return["forwarding_index"] = self.forwarding_index
+            to_return["forwarded_sheet"] = self.forwarded_sheet
+        return to_return
+
+    def is_forwarded(self) -> bool:
+        """
+        Returns if the values are stored in other files which are listed in the table of the names
+        """
+        return self.forwarding_index >= 0
+
+    @staticmethod
+    def create_linear_table(path: str, file: str, sheet: str, value_position: CellPosition, value_is_fixed_row: bool,
+                            name_position: CellPosition, name_is_fixed_row: bool) -> SinkPath:
+        """
+        Creates an instance for a row- or column-table whose names and values are stored in the same sheet
+
+        :param path: the path the instance was parsed from
+        :param file: the xlsx-file holding the table
+        :param sheet: the sheet holding the table
+        :param value_position: the position the values start at
+        :param value_is_fixed_row: if the values are read along a row
+        :param name_position: the position the names start at
+        :param name_is_fixed_row: if the names are read along a row
+        :return: the parsed path
+        """
+        return SinkPath(path, SinkPathType.LINEAR_TABLE, file, sheet, value_position, value_is_fixed_row,
+                        name_position, name_is_fixed_row)
+
+    @staticmethod
+    def create_forwarded_table(path: str, file: str, sheet: str, value_position: CellPosition,
+                               value_is_fixed_row: bool, name_position: CellPosition, name_is_fixed_row: bool,
+                               forwarding_index: int, forwarded_sheet: str) -> SinkPath:
+        """
+        Creates an instance for a row- or column-table whose values are stored in the files its names point to
+
+        :param path: the path the instance was parsed from
+        :param file: the xlsx-file holding the names
+        :param sheet: the sheet holding the names
+        :param value_position: the position the values start at in the forwarded sheet
+        :param value_is_fixed_row: if the values are read along a row
+        :param name_position: the position the names start at
+        :param name_is_fixed_row: if the names are read along a row
+        :param forwarding_index: the index of the row or column holding the file names
+        :param forwarded_sheet: the sheet of the forwarded files which holds the values
+        :return: the parsed path
+        """
+        sink_path = SinkPath(path, SinkPathType.LINEAR_TABLE, file, sheet, value_position, value_is_fixed_row,
+                             name_position, name_is_fixed_row)
+        sink_path.forwarding_index = forwarding_index
+        sink_path.forwarded_sheet = forwarded_sheet
+        return sink_path
+
+    @staticmethod
+    def create_cross_table(path: str, file: str, sheet: str, cross_area: CellPosition, value_position: CellPosition,
+                           value_is_fixed_row: bool, name_position: CellPosition, name_is_fixed_row: bool) -> SinkPath:
+        """
+        Creates an instance for a cross table which associates names and values by markers in its cross area
+
+        :param path: the path the instance was parsed from
+        :param file: the xlsx-file holding the table
+        :param sheet: the sheet holding the table
+        :param cross_area: the position the cross area starts at
+        :param value_position: the position the values start at
+        :param value_is_fixed_row: if the values are read along a row
+        :param name_position: the position the names start at
+        :param name_is_fixed_row: if the names are read along a row
+        :return: the parsed path
+        """
+        sink_path = SinkPath(path, SinkPathType.CROSS_TABLE, file, sheet, value_position, value_is_fixed_row,
+                             name_position, name_is_fixed_row)
+        sink_path.cross_area = cross_area
+        return sink_path
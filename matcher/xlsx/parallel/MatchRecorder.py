@@ -0,0 +1,35 @@
+from typing import List
+
+
+class MatchRecorder:
+    """
+    Stands in for the classifier inside a worker process: the potential matches are only recorded so that they can be
+    handed back to the parent process which pushes them into the real classifier
+    """
+
+    __matches: List[str]
+
+    def __init__(self):
+        """
+        The constructor
+        """
+        self.__matches = []
+
+    def add_potential_match(self, match_path: str, source_path: str = "") -> None:
+        """
+        Records the given match. The source path is ignored as the parent process knows which pairs were scanned
+
+        :param match_path: the path to a potential match in the sink file
+        :param source_path: the path to data in the source file
+        """
+        self.__matches.append(match_path)
+
+    def take(self) -> List[str]:
+        """
+        Returns the matches recorded so far in the order they were added and starts over with an empty record
+
+        :return: the list of match paths
+        """
+        matches = self.__matches
+        self.__matches = []
+        return matches
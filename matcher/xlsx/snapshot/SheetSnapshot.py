@@ -0,0 +1,473 @@
+from __future__ import annotations
+from array import array
+from mmap import mmap
+from typing import Dict, List, Iterator, Tuple
+import sys
+from openpyxl import load_workbook
+from openpyxl.cell import Cell
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.worksheet.worksheet import Worksheet
+
+
+class SnapshotCell:
+    """
+    A lightweight view of one cell of a SheetSnapshot which offers the cell properties the processors are reading
+    """
+    __slots__ = ("value", "row", "column", "color", "span")
+
+    def __init__(self, value: object, row: int, column: int, color: str, span: int):
+        """
+        The constructor
+
+        :param value: the content of the cell
+        :param row: the row index of the cell as xlsx counts them
+        :param column: the column index of the cell as xlsx counts them
+        :param color: the ARGB of the cell background color
+        :param span: the size of the cell in the count of columns
+        """
+        self.value = value
+        self.row = row
+        self.column = column
+        self.color = color
+        self.span = span
+
+    @property
+    def column_letter(self) -> str:
+        return get_column_letter(self.column)
+
+    @property
+    def coordinate(self) -> str:
+        return "{}{}".format(self.column_letter, self.row)
+
+
+class SheetSnapshot:
+
+    EMPTY = -1
+    DEFAULT_COLOR = "00000000"
+
+    title: str
+    parent: WorkbookSnapshot
+    max_row: int
+    max_column: int
+    __values: List[object]
+    __colors: List[str]
+    __row_values: array
+    __row_colors: array
+    __row_spans: array
+    __column_values: array
+    __column_colors: array
+    # the index of the last cell holding a value per row and per column (0 if there's none) -> derived on demand
+    __row_extents: array
+    __column_extents: array
+
+    def __init__(self, title: str, max_row: int, max_column: int, values: List[object], colors: List[str],
+                 value_ids: array, color_ids: array, spans: array, column_value_ids: array = None,
+                 column_color_ids: array = None):
+        """
+        The constructor which is discouraged to be used outside of the static factory methods
+
+        :param title: the title of the sheet
+        :param max_row: the count of rows the sheet spans
+        :param max_column: the count of columns the sheet spans
+        :param values: the table of (unique) cell contents the value ids point into
+        :param colors: the table of (unique) background colors the color ids point into
+        :param value_ids: the index into the value table per cell in row-major order (EMPTY for empty cells). All id
+                          arrays can also be given as (memory mapped) integer memoryview
+        :param color_ids: the index into the color table per cell in row-major order
+        :param spans: the size of each cell in the count of columns in row-major order
+        :param column_value_ids: the value ids in column-major order. Derived from the row-major ones if not given
+        :param column_color_ids: the color ids in column-major order. Derived from the row-major ones if not given
+        """
+        self.title = title
+        self.parent = None
+        self.max_row = max_row
+        self.max_column = max_column
+        self.__values = values
+        self.__colors = colors
+        self.__row_values = value_ids
+        self.__row_colors = color_ids
+        self.__row_spans = spans
+        if column_value_ids is None:
+            column_value_ids = SheetSnapshot.__transpose(value_ids, max_row, max_column)
+        if column_color_ids is None:
+            column_color_ids = SheetSnapshot.__transpose(color_ids, max_row, max_column)
+        self.__column_values = column_value_ids
+        self.__column_colors = column_color_ids
+        self.__row_extents = None
+        self.__column_extents = None
+
+    def __getitem__(self, key):
+        """
+        Mimics the indexing of a openpyxl worksheet: an integer addresses a row, a column letter a column and a
+        coordinate a single cell
+        """
+        if isinstance(key, int):
+            return self.row(key)
+        if key.isalpha():
+            return self.column(column_index_from_string(key))
+        letters = key.rstrip("0123456789")
+        return self.cell(int(key[len(letters):]), column_index_from_string(letters))
+
+    def cell(self, row: int, column: int) -> SnapshotCell:
+        """
+        Returns the view on the cell at the given position. Positions outside of the sheet are treated as empty cells
+
+        :param row: the row index of the cell as xlsx counts them
+        :param column: the column index of the cell as xlsx counts them
+        :return: the view on the cell
+        """
+        if not self.__contains(row, column):
+            return SnapshotCell(None, row, column, self.DEFAULT_COLOR, 1)
+        offset = (row - 1) * self.max_column + column - 1
+        return SnapshotCell(self.__value_of(self.__row_values[offset]), row, column,
+                            self.__colors[self.__row_colors[offset]], self.__row_spans[offset])
+
+    def merged_span(self, row: int, column: int) -> int:
+        """
+        Returns the size of the cell at the given position in the count of columns
+
+        :param row: the row index of the cell as xlsx counts them
+        :param column: the column index of the cell as xlsx counts them
+        :return: the size of the merged range the cell belongs to else 1
+        """
+        if not self.__contains(row, column):
+            return 1
+        return self.__row_spans[(row - 1) * self.max_column + column - 1]
+
+    def row(self, row: int, min_col: int = 1) -> List[SnapshotCell]:
+        """
+        Returns the cells of the given row from the given column to the last column of the sheet
+
+        :param row: the row index as xlsx counts them
+        :param min_col: the column index to start with
+        :return: the views on the cells of the row
+        """
+        return self.__row_cells(row, min_col, self.max_column)
+
+    def column(self, column: int, min_row: int = 1) -> List[SnapshotCell]:
+        """
+        Returns the cells of the given column from the given row to the last row of the sheet
+
+        :param column: the column index as xlsx counts them
+        :param min_row: the row index to start with
+        :return: the views on the cells of the column
+        """
+        return self.__column_cells(column, min_row, self.max_row)
+
+    def occupied_row(self, row: int, min_col: int = 1) -> List[SnapshotCell]:
+        """
+        Works like row() but stops at the last cell of the row which holds a value. Meant for scans which skip empty
+        cells anyway
+
+        :param row: the row index as xlsx counts them
+        :param min_col: the column index to start with
+        :return: the views on the cells of the row up to its last non-empty one
+        """
+        if not 1 <= row <= self.max_row:
+            return []
+        return self.__row_cells(row, min_col, self.__get_extents()[0][row])
+
+    def occupied_column(self, column: int, min_row: int = 1) -> List[SnapshotCell]:
+        """
+        Works like column() but stops at the last cell of the column which holds a value. Meant for scans which skip
+        empty cells anyway
+
+        :param column: the column index as xlsx counts them
+        :param min_row: the row index to start with
+        :return: the views on the cells of the column up to its last non-empty one
+        """
+        if not 1 <= column <= self.max_column:
+            return []
+        return self.__column_cells(column, min_row, self.__get_extents()[1][column])
+
+    def get_used_range(self) -> Tuple[int, int, int, int]:
+        """
+        Returns the bounding box of all cells holding a value
+
+        :return: a tuple of the first row, the first column, the last row and the last column as xlsx counts them. For
+                 a sheet without any value the last row and column are 0
+        """
+        row_extents, column_extents = self.__get_extents()
+        used_rows = [x for x in range(1, self.max_row + 1) if row_extents[x]]
+        used_columns = [x for x in range(1, self.max_column + 1) if column_extents[x]]
+        if not used_rows:
+            return 1, 1, 0, 0
+        return used_rows[0], used_columns[0], used_rows[-1], used_columns[-1]
+
+    def iter_rows(self, min_row: int = 1, max_row: int = None) -> Iterator[List[SnapshotCell]]:
+        """
+        Iterates row by row over the sheet
+
+        :param min_row: the index of the first row to return
+        :param max_row: the index of the last row to return. Defaults to the last row of the sheet
+        :return: the rows as lists of cells
+        """
+        last_row = self.max_row if max_row is None else max_row
+        return (self.row(row) for row in range(min_row, last_row + 1))
+
+    def iter_cols(self, min_col: int = 1, max_col: int = None) -> Iterator[List[SnapshotCell]]:
+        """
+        Iterates column by column over the sheet
+
+        :param min_col: the index of the first column to return
+        :param max_col: the index of the last column to return. Defaults to the last column of the sheet
+        :return: the columns as lists of cells
+        """
+        last_column = self.max_column if max_col is None else max_col
+        return (self.column(column) for column in range(min_col, last_column + 1))
+
+    def get_nbytes(self) -> int:
+        """
+        Estimates the memory the snapshot occupies
+
+        :return: the size of the arrays and the value table in bytes
+        """
+        size = sum(len(x) * x.itemsize for x in self.get_arrays())
+        return size + sum(sys.getsizeof(x) for x in self.__values)
+
+    def get_value_table(self) -> List[object]:
+        """
+        Returns a copy of the table of unique cell contents the value ids point into
+        """
+        return list(self.__values)
+
+    def get_color_table(self) -> List[str]:
+        """
+        Returns a copy of the table of unique background colors the color ids point into
+        """
+        return list(self.__colors)
+
+    def copy_mapped_arrays(self) -> None:
+        """
+        Replaces the id arrays which are memory mapped by copies in memory and releases the mapped ones so that the
+        files they are mapped from can be closed
+        """
+        arrays = []
+        for to_copy in self.get_arrays():
+            if isinstance(to_copy, memoryview):
+                copy = array(to_copy.format)
+                copy.frombytes(to_copy.tobytes())
+                to_copy.release()
+                to_copy = copy
+            arrays.append(to_copy)
+        self.__row_values, self.__row_colors, self.__row_spans, self.__column_values, self.__column_colors = arrays
+
+    def get_arrays(self) -> List[array]:
+        """
+        Returns the id arrays in the order the constructor expects them: the row-major value ids, color ids and spans
+        followed by the column-major value ids and color ids
+        """
+        return [self.__row_values, self.__row_colors, self.__row_spans, self.__column_values, self.__column_colors]
+
+    def __row_cells(self, row: int, min_col: int, max_col: int) -> List[SnapshotCell]:
+        """
+        Returns the cells of the given row from the given column to the given column
+        """
+        if not 1 <= row <= self.max_row:
+            return [self.cell(row, column) for column in range(min_col, max_col + 1)]
+        offset = (row - 1) * self.max_column - 1
+        return [SnapshotCell(self.__value_of(self.__row_values[offset + column]), row, column,
+                             self.__colors[self.__row_colors[offset + column]], self.__row_spans[offset + column])
+                for column in range(max(min_col, 1), max_col + 1)]
+
+    def __column_cells(self, column: int, min_row: int, max_row: int) -> List[SnapshotCell]:
+        """
+        Returns the cells of the given column from the given row to the given row
+        """
+        if not 1 <= column <= self.max_column:
+            return [self.cell(row, column) for row in range(min_row, max_row + 1)]
+        offset = (column - 1) * self.max_row - 1
+        span_offset = column - 1 - self.max_column
+        return [SnapshotCell(self.__value_of(self.__column_values[offset + row]), row, column,
+                             self.__colors[self.__column_colors[offset + row]],
+                             self.__row_spans[span_offset + row * self.max_column])
+                for row in range(max(min_row, 1), max_row + 1)]
+
+    def __get_extents(self) -> Tuple[array, array]:
+        """
+        Returns the index of the last cell holding a value per row and per column. They are collected with the first
+        call as only scans are interested in them
+        """
+        if self.__row_extents is None:
+            row_extents = array("i", [0]) * (self.max_row + 1)
+            column_extents = array("i", [0]) * (self.max_column + 1)
+            value_ids = self.__row_values
+            for offset in range(len(value_ids)):
+                if value_ids[offset] == self.EMPTY:
+                    continue
+                row, column = divmod(offset, self.max_column)
+                # the cells are visited row by row -> the last visit of a line is its last non-empty cell
+                row_extents[row + 1] = column + 1
+                column_extents[column + 1] = row + 1
+            self.__column_extents = column_extents
+            self.__row_extents = row_extents
+        return self.__row_extents, self.__column_extents
+
+    def __contains(self, row: int, column: int) -> bool:
+        """
+        Returns if the given position lies within the area the sheet spans
+        """
+        return 1 <= row <= self.max_row and 1 <= column <= self.max_column
+
+    def __value_of(self, value_id: int) -> object:
+        """
+        Resolves the given value id to the cell content it represents
+        """
+        return None if value_id == self.EMPTY else self.__values[value_id]
+
+    @staticmethod
+    def from_worksheet(sheet: Worksheet) -> SheetSnapshot:
+        """
+        Reads the given openpyxl worksheet once and converts it into a snapshot
+
+        :param sheet: the sheet to convert
+        :return: the snapshot holding the values, background colors and merged spans of the sheet
+        """
+        # formatting applied to whole lines makes openpyxl report a size far beyond the cells in use
+        untouched_color = Cell(sheet).fill.start_color.index
+        used = [(x.max_row, x.max_col) for x in sheet.merged_cells.ranges]
+        contents: List[List[Tuple[object, object]]] = []
+        for row in sheet.iter_rows(min_row=1, max_row=sheet.max_row, min_col=1, max_col=sheet.max_column):
+            contents.append([(cell.value, cell.fill.start_color.index) for cell in row])
+            # the last cell of the row which differs from a cell never written to is enough to trim the row
+            for column in range(len(row), 0, -1):
+                value, color = contents[-1][column - 1]
+                if value is not None or color != untouched_color:
+                    used.append((len(contents), column))
+                    break
+        max_row, max_column = SheetSnapshot.trim_size(sheet.max_row, sheet.max_column, used)
+        rows = (x[:max_column] for x in contents[:max_row])
+        merged = ((x.min_row, x.min_col, x.max_row, x.max_col) for x in sheet.merged_cells.ranges)
+        return SheetSnapshot.from_rows(sheet.title, max_row, max_column, rows, merged)
+
+    @staticmethod
+    def trim_size(max_row: int, max_column: int, used: Iterator[Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        Shrinks the size a sheet declares to the area of the cells which differ from a cell never written to. Such
+        cells are empty and look the same which makes all of them beyond the first one redundant. The first one is
+        kept as scans react to the transition into the empty area
+
+        :param max_row: the count of rows the sheet declares
+        :param max_column: the count of columns the sheet declares
+        :param used: the positions of the cells holding a value, a fill or a merged range as row-column-tuples
+        :return: a tuple of the count of rows and the count of columns to read from the sheet
+        """
+        used_row = 0
+        used_column = 0
+        for row, column in used:
+            used_row = max(used_row, row)
+            used_column = max(used_column, column)
+        return max(min(max_row, used_row + 1), 1), max(min(max_column, used_column + 1), 1)
+
+    @staticmethod
+    def from_rows(title: str, max_row: int, max_column: int, rows: Iterator[Iterator[Tuple[object, object]]],
+                  merged_ranges: Iterator[Tuple[int, int, int, int]]) -> SheetSnapshot:
+        """
+        Creates a snapshot from the cells handed in row by row no matter which reader extracted them
+
+        :param title: the title of the sheet
+        :param max_row: the count of rows the sheet spans
+        :param max_column: the count of columns the sheet spans
+        :param rows: the rows of the sheet each given as the value-color-tuples of all its cells
+        :param merged_ranges: the merged ranges of the sheet as tuples of min row, min column, max row and max column
+        :return: the snapshot holding the values, background colors and merged spans of the sheet
+        """
+        value_table: Dict[Tuple[type, object], int] = {}
+        color_table: Dict[object, int] = {}
+        value_ids = array("i", [SheetSnapshot.EMPTY]) * (max_row * max_column)
+        color_ids = array("i", [0]) * (max_row * max_column)
+        spans = array("i", [1]) * (max_row * max_column)
+        offset = 0
+        for row in rows:
+            for value, color in row:
+                if value is not None:
+                    # intern with the type as well as eg. 1 and True would end up as the same entry otherwise
+                    value_ids[offset] = value_table.setdefault((type(value), value), len(value_table))
+                color_ids[offset] = color_table.setdefault(color, len(color_table))
+                offset += 1
+        for min_row, min_col, last_row, last_col in merged_ranges:
+            # as merged cells only expand in columns
+            width = last_col - min_col + 1
+            for row_index in range(min_row, min(last_row, max_row) + 1):
+                for column_index in range(min_col, min(last_col, max_column) + 1):
+                    offset = (row_index - 1) * max_column + column_index - 1
+                    # ranges shouldn't overlap but if they do the first one wins
+                    if spans[offset] == 1:
+                        spans[offset] = width
+        values = [x[1] for x in value_table.keys()]
+        colors = list(color_table.keys())
+        return SheetSnapshot(title, max_row, max_column, values, colors, value_ids, color_ids, spans)
+
+    @staticmethod
+    def __transpose(row_major: array, max_row: int, max_column: int) -> array:
+        """
+        Converts the given row-major array into a column-major one
+        """
+        column_major = array(row_major.typecode, row_major)
+        for column in range(max_column):
+            column_major[column * max_row:(column + 1) * max_row] = row_major[column::max_column]
+        return column_major
+
+
+class WorkbookSnapshot:
+
+    sheetnames: List[str]
+    __sheets: Dict[str, SheetSnapshot]
+    __mapped_files: List[mmap]
+
+    def __init__(self, sheets: List[SheetSnapshot], mapped_files: List[mmap] = None):
+        """
+        The constructor
+
+        :param sheets: the snapshots of the sheets in the order they appear in the workbook
+        :param mapped_files: the memory mapped files the arrays of the sheets are read from (if any)
+        """
+        self.sheetnames = []
+        self.__sheets = {}
+        self.__mapped_files = mapped_files if mapped_files is not None else []
+        for sheet in sheets:
+            sheet.parent = self
+            self.sheetnames.append(sheet.title)
+            self.__sheets[sheet.title] = sheet
+
+    def __getitem__(self, sheet_name: str) -> SheetSnapshot:
+        return self.__sheets[sheet_name]
+
+    def close(self) -> None:
+        """
+        Closes the memory mapped files the arrays of the sheets are read from so that the files can be deleted. The
+        sheets stay usable (for whoever still holds them) as their arrays are copied into memory first
+        """
+        if not self.__mapped_files:
+            return
+        for sheet in self.__sheets.values():
+            sheet.copy_mapped_arrays()
+        for mapped in self.__mapped_files:
+            try:
+                mapped.close()
+            except BufferError:
+                # someone still holds a view on the file -> it is closed as soon as the view is dropped
+                pass
+        self.__mapped_files = []
+
+    def get_nbytes(self) -> int:
+        """
+        Estimates the memory all sheet snapshots occupy
+
+        :return: the size in bytes
+        """
+        return sum(x.get_nbytes() for x in self.__sheets.values())
+
+    @staticmethod
+    def load(path: str) -> WorkbookSnapshot:
+        """
+        Parses the given xlsx-file with openpyxl and converts all of its sheets into snapshots
+
+        :param path: the path to the xlsx-file
+        :return: the snapshot of the workbook
+        """
+        workbook = load_workbook(path)
+        try:
+            return WorkbookSnapshot([SheetSnapshot.from_worksheet(workbook[x]) for x in workbook.sheetnames])
+        finally:
+            workbook.close()
@@ -0,0 +1,374 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple, Set, IO, Iterator
+from xml.etree.ElementTree import iterparse, fromstring, Element
+from zipfile import ZipFile
+import posixpath
+
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils.cell import coordinate_to_tuple, range_boundaries
+from openpyxl.utils.datetime import from_excel, from_ISO8601, CALENDAR_WINDOWS_1900, CALENDAR_MAC_1904
+from openpyxl.worksheet.formula import ArrayFormula, DataTableFormula
+
+from matcher.xlsx.snapshot.SheetSnapshot import SheetSnapshot, WorkbookSnapshot
+
+
+class ZipWorkbookReader:
+    """
+    Reads the snapshots of a xlsx-file directly from the XML-files inside the zip archive. Only the parts the snapshot
+    consists of (cell contents, background colors and merged ranges) are extracted. The results are the same openpyxl
+    delivers which stays the reference
+    """
+
+    MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+    REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+    PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+    DOCUMENT_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+    WORKSHEET_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"
+    SHARED_STRINGS_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"
+    COMMENTS_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/comments"
+    STYLES_PATH = "xl/styles.xml"
+
+    __archive: ZipFile
+    __files: Set[str]
+    __shared_strings: List[str]
+    # the background color per entry of the cell style table -> the fills are resolved only once
+    __style_colors: List[object]
+    __default_color: object
+    __date_styles: Set[int]
+    __timedelta_styles: Set[int]
+    __epoch: object
+
+    def __init__(self, archive: ZipFile):
+        """
+        The constructor which reads the tables all sheets share
+
+        :param archive: the opened xlsx-file
+        """
+        self.__archive = archive
+        self.__files = set(archive.namelist())
+        self.__shared_strings = []
+        self.__style_colors = [SheetSnapshot.DEFAULT_COLOR]
+        self.__default_color = SheetSnapshot.DEFAULT_COLOR
+        self.__date_styles = set()
+        self.__timedelta_styles = set()
+        self.__epoch = CALENDAR_WINDOWS_1900
+        self.__read_styles()
+
+    def read(self) -> WorkbookSnapshot:
+        """
+        Reads all worksheets of the workbook in the order they appear in it
+
+        :return: the snapshot of the workbook
+        """
+        workbook_path = self.__find_workbook_path()
+        relations = self.__read_relations(workbook_path)
+        root = fromstring(self.__archive.read(workbook_path))
+        properties = root.find(self.MAIN_NS + "workbookPr")
+        if properties is not None and ZipWorkbookReader.__to_bool(properties.get("date1904", "false")):
+            self.__epoch = CALENDAR_MAC_1904
+        for relation_type, target in relations.values():
+            if relation_type == self.SHARED_STRINGS_TYPE and target in self.__files:
+                with self.__archive.open(target) as stream:
+                    self.__read_shared_strings(stream)
+        sheets: List[SheetSnapshot] = []
+        for sheet in root.iter(self.MAIN_NS + "sheet"):
+            relation = relations.get(sheet.get(self.REL_NS + "id"))
+            # chartsheets hold no cells -> openpyxl does not list them as worksheets either
+            if relation is None or relation[0] != self.WORKSHEET_TYPE or relation[1] not in self.__files:
+                continue
+            sheets.append(self.__read_sheet(sheet.get("name"), relation[1]))
+        return WorkbookSnapshot(sheets)
+
+    def __read_sheet(self, title: str, path: str) -> SheetSnapshot:
+        """
+        Streams the XML of one worksheet row by row and converts it into a snapshot
+
+        :param title: the title of the sheet
+        :param path: the path of the worksheet XML inside the archive
+        :return: the snapshot of the sheet
+        """
+        # the contents per column per row -> the merged ranges and thus the size of the sheet are only known at its end
+        rows: Dict[int, Dict[int, Tuple[object, object]]] = {}
+        merged: List[Tuple[int, int, int, int]] = []
+        referenced: List[str] = []
+        shared_formulae: Dict[str, Translator] = {}
+        sheet_data_tag = self.MAIN_NS + "sheetData"
+        row_tag = self.MAIN_NS + "row"
+        sheet_data = None
+        row_index = 0
+        with self.__archive.open(path) as stream:
+            for event, element in iterparse(stream, ("start", "end")):
+                if event == "start":
+                    if element.tag == sheet_data_tag:
+                        sheet_data = element
+                elif element.tag == row_tag:
+                    row_index = self.__read_row(element, row_index, rows, shared_formulae)
+                    # drop the row from the tree as well -> only the row being parsed is held in memory
+                    if sheet_data is not None:
+                        sheet_data.remove(element)
+                elif element.tag == self.MAIN_NS + "mergeCell":
+                    min_col, min_row, max_col, max_row = range_boundaries(element.get("ref"))
+                    merged.append((min_row, min_col, max_row, max_col))
+                elif element.tag == self.MAIN_NS + "hyperlink":
+                    referenced.append(element.get("ref"))
+        empty = (None, self.__default_color)
+        # openpyxl creates the cells of merged ranges and the ones linked to hyperlinks or comments on the fly
+        declared = [(x[2], x[3]) for x in merged]
+        referenced.extend(self.__read_comment_references(path))
+        for reference in referenced:
+            _, _, max_col, max_row = range_boundaries(reference)
+            declared.append((max_row, max_col))
+        # the contents a merged range replaces lie inside of it -> the end of the range covers them
+        used = [(x[2], x[3]) for x in merged]
+        for row, cells in rows.items():
+            declared.append((row, max(cells)))
+            used_columns = [x for x, content in cells.items() if content != empty]
+            if used_columns:
+                used.append((row, max(used_columns)))
+        max_row, max_column = SheetSnapshot.trim_size(max((x[0] for x in declared), default=1),
+                                                      max((x[1] for x in declared), default=1), used)
+        for min_row, min_col, max_merged_row, max_merged_col in merged:
+            # openpyxl replaces all but the top left cell of a merged range by empty cells
+            for row in range(min_row, min(max_merged_row, max_row) + 1):
+                cells = rows.get(row)
+                if cells is None:
+                    continue
+                for column in range(min_col, min(max_merged_col, max_column) + 1):
+                    if (row, column) != (min_row, min_col):
+                        cells.pop(column, None)
+        return SheetSnapshot.from_rows(title, max_row, max_column, self.__emit_rows(rows, max_row, max_column, empty),
+                                       merged)
+
+    @staticmethod
+    def __emit_rows(rows: Dict[int, Dict[int, Tuple[object, object]]], max_row: int, max_column: int,
+                    empty: Tuple[object, object]) -> Iterator[Iterator[Tuple[object, object]]]:
+        """
+        Hands the read rows over one after the other and drops each of them once it is handed over
+
+        :param rows: the contents per column per row
+        :param max_row: the count of rows to hand over
+        :param max_column: the count of cells to hand over per row
+        :param empty: the content of cells not stated in the sheet
+        :return: the value-color-tuples of all cells row by row
+        """
+        for row in range(1, max_row + 1):
+            cells = rows.pop(row, {})
+            yield [cells.get(column, empty) for column in range(1, max_column + 1)]
+
+    def __read_row(self, row: Element, last_row: int, rows: Dict[int, Dict[int, Tuple[object, object]]],
+                   shared_formulae: Dict[str, Translator]) -> int:
+        """
+        Reads the cells of the given row element into the given dictionary
+
+        :param row: the row element
+        :param last_row: the index of the row read before
+        :param rows: the dictionary of row to column to value-color-tuple to fill
+        :param shared_formulae: the shared formulae of the sheet read so far
+        :return: the index of this row
+        """
+        row_index = last_row + 1
+        if "r" in row.attrib:
+            row_index = int(float(row.get("r")))
+        column_index = 0
+        for element in row:
+            coordinate = element.get("r")
+            if coordinate:
+                row_of_cell, column_index = coordinate_to_tuple(coordinate)
+            else:
+                column_index += 1
+                row_of_cell = row_index
+            style_id = int(element.get("s", 0))
+            cells = rows.setdefault(row_of_cell, {})
+            cells[column_index] = (self.__read_value(element, style_id, coordinate, shared_formulae),
+                                   self.__style_colors[style_id])
+        return row_index
+
+    def __read_value(self, cell: Element, style_id: int, coordinate: str,
+                     shared_formulae: Dict[str, Translator]) -> object:
+        """
+        Converts the content of the given cell element the way openpyxl does
+
+        :param cell: the cell element
+        :param style_id: the index into the cell style table
+        :param coordinate: the coordinate the cell states (if any)
+        :param shared_formulae: the shared formulae of the sheet read so far
+        :return: the content of the cell
+        """
+        data_type = cell.get("t", "n")
+        formula = cell.find(self.MAIN_NS + "f")
+        if formula is not None:
+            return ZipWorkbookReader.__read_formula(formula, coordinate, shared_formulae)
+        if data_type == "inlineStr":
+            inline = cell.find(self.MAIN_NS + "is")
+            return None if inline is None else self.__text_of(inline)
+        value = cell.findtext(self.MAIN_NS + "v", None) or None
+        if value is None:
+            return None
+        if data_type == "n":
+            value = float(value) if "." in value or "e" in value or "E" in value else int(value)
+            if style_id in self.__date_styles:
+                try:
+                    return from_excel(value, self.__epoch, timedelta=style_id in self.__timedelta_styles)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if data_type == "s":
+            return self.__shared_strings[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        return value
+
+    @staticmethod
+    def __read_formula(formula: Element, coordinate: str, shared_formulae: Dict[str, Translator]) -> object:
+        """
+        Converts the formula element of a cell into the object openpyxl represents it with
+        """
+        formula_type = formula.get("t")
+        value = "=" + (formula.text if formula.text is not None else "")
+        if formula_type == "array":
+            return ArrayFormula(ref=formula.get("ref"), text=value)
+        if formula_type == "shared":
+            index = formula.get("si")
+            if index in shared_formulae:
+                return shared_formulae[index].translate_formula(coordinate)
+            if value != "=":
+                shared_formulae[index] = Translator(value, coordinate)
+        elif formula_type == "dataTable":
+            return DataTableFormula(**formula.attrib)
+        return value
+
+    def __read_shared_strings(self, stream: IO[bytes]) -> None:
+        """
+        Reads the plain text of all entries of the shared string table
+        """
+        for _, element in iterparse(stream):
+            if element.tag == self.MAIN_NS + "si":
+                self.__shared_strings.append(self.__text_of(element).replace("x005F_", ""))
+                element.clear()
+
+    def __text_of(self, element: Element) -> str:
+        """
+        Joins the plain text and the text of all formatted runs of the given string element (phonetic hints excluded)
+        """
+        snippets = []
+        plain = element.find(self.MAIN_NS + "t")
+        if plain is not None and plain.text is not None:
+            snippets.append(plain.text)
+        for run in element.iterfind(self.MAIN_NS + "r"):
+            text = run.findtext(self.MAIN_NS + "t", None)
+            if text is not None:
+                snippets.append(text)
+        return "".join(snippets)
+
+    def __read_styles(self) -> None:
+        """
+        Resolves the background color and the date format of every cell style once
+        """
+        if self.STYLES_PATH not in self.__files:
+            return
+        root = fromstring(self.__archive.read(self.STYLES_PATH))
+        cell_styles = root.find(self.MAIN_NS + "cellXfs")
+        if cell_styles is None or len(cell_styles) == 0:
+            # openpyxl ignores a style sheet without cell styles as well
+            return
+        fill_colors = [self.__color_of(x) for x in root.iterfind("{0}fills/{0}fill".format(self.MAIN_NS))]
+        if fill_colors:
+            self.__default_color = fill_colors[0]
+        custom_formats = {int(x.get("numFmtId")): x.get("formatCode")
+                          for x in root.iterfind("{0}numFmts/{0}numFmt".format(self.MAIN_NS))}
+        self.__style_colors = []
+        for index, style in enumerate(cell_styles.iterfind(self.MAIN_NS + "xf")):
+            fill_id = int(style.get("fillId", 0))
+            self.__style_colors.append(fill_colors[fill_id] if fill_id < len(fill_colors) else self.__default_color)
+            format_id = int(style.get("numFmtId", 0))
+            if format_id in custom_formats:
+                number_format = custom_formats[format_id]
+            else:
+                number_format = builtin_format_code(format_id)
+            if is_date_format(number_format):
+                self.__date_styles.add(index)
+            if is_timedelta_format(number_format):
+                self.__timedelta_styles.add(index)
+
+    def __color_of(self, fill: Element) -> object:
+        """
+        Returns the foreground color of the given fill the same way openpyxl's Color.index does: an indexed color
+        takes precedence over a theme color which takes precedence over the auto flag and the ARGB value
+        """
+        pattern = fill.find(self.MAIN_NS + "patternFill")
+        color = None if pattern is None else pattern.find(self.MAIN_NS + "fgColor")
+        if color is None:
+            return SheetSnapshot.DEFAULT_COLOR
+        if color.get("indexed") is not None:
+            return int(color.get("indexed"))
+        if color.get("theme") is not None:
+            return int(color.get("theme"))
+        if color.get("auto") is not None:
+            return ZipWorkbookReader.__to_bool(color.get("auto"))
+        rgb = color.get("rgb", SheetSnapshot.DEFAULT_COLOR)
+        # the alpha channel defaults to 00 if left out
+        return "00" + rgb if len(rgb) == 6 else rgb
+
+    def __read_comment_references(self, sheet_path: str) -> List[str]:
+        """
+        Returns the coordinates of all comments attached to the given sheet
+        """
+        references = []
+        for relation_type, target in self.__read_relations(sheet_path).values():
+            if relation_type == self.COMMENTS_TYPE and target in self.__files:
+                root = fromstring(self.__archive.read(target))
+                references.extend(x.get("ref") for x in root.iter(self.MAIN_NS + "comment"))
+        return references
+
+    def __find_workbook_path(self) -> str:
+        """
+        Returns the path of the workbook part as the package relations state it
+        """
+        for relation_type, target in self.__read_relations("").values():
+            if relation_type == self.DOCUMENT_TYPE and target in self.__files:
+                return target
+        return "xl/workbook.xml"
+
+    def __read_relations(self, part_path: str) -> Dict[str, Tuple[str, str]]:
+        """
+        Reads the relations of the given part of the archive
+
+        :param part_path: the path of the part inside the archive (an empty string addresses the package itself)
+        :return: a dictionary of relation id to type-target-tuple with the target as path inside the archive
+        """
+        folder, file_name = posixpath.split(part_path)
+        relations_path = posixpath.join(folder, "_rels", file_name + ".rels")
+        if relations_path not in self.__files:
+            return {}
+        relations = {}
+        for relation in fromstring(self.__archive.read(relations_path)).iter(self.PACKAGE_REL_NS + "Relationship"):
+            if relation.get("TargetMode") == "External":
+                continue
+            target = relation.get("Target")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            relations[relation.get("Id")] = (relation.get("Type"), target)
+        return relations
+
+    @staticmethod
+    def __to_bool(value: str) -> bool:
+        """
+        Converts a boolean XML attribute the way openpyxl does
+        """
+        return value not in ["false", "f", "0"] and bool(value)
+
+    @staticmethod
+    def load(path: str) -> WorkbookSnapshot:
+        """
+        Reads the given xlsx-file without openpyxl and converts all of its worksheets into snapshots
+
+        :param path: the path to the xlsx-file
+        :return: the snapshot of the workbook
+        """
+        with ZipFile(path) as archive:
+            return ZipWorkbookReader(archive).read()
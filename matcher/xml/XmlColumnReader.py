@@ -0,0 +1,141 @@
+from typing import List, Tuple, Dict
+import re
+import xml.etree.ElementTree as ElemTree
+
+
+class XmlColumnReader:
+    """
+    Collects the values of many paths below the nodes of a list: each path yields the column of the values of its node
+    (or attribute) in all nodes of the list. The nodes are read in one walk per list node no matter how many paths
+    there are. Paths with steps beyond plain node names and positions are resolved on their own
+    """
+
+    # a path made of node names which are optionally followed by a position only
+    __SIMPLE_NODE_PATH = re.compile(r"(/[\w.\-]+(\[[1-9]\d*])?)+")
+
+    # the steps of all simple paths as tree: each step maps to the tree of its following steps -> the nodes found for
+    # the path ending with a step are collected under None
+    __step_tree: Dict[str, dict]
+    # (path, the step tree its last step maps to, attribute name) of the paths resolved by walking the step tree
+    __walked: List[Tuple[str, dict, str]]
+    # (path, node path, attribute name) of the paths resolved on their own
+    __searched: List[Tuple[str, str, str]]
+    # the count of the list nodes read so far per name
+    __positions: Dict[str, int]
+    __values: Dict[str, List[str]]
+
+    def __init__(self, paths: List[str]):
+        """
+        The constructor
+
+        :param paths: the paths to collect the values of. They start with the name of the list node
+        """
+        self.__step_tree = {}
+        self.__walked = []
+        self.__searched = []
+        self.__positions = {}
+        self.__values = {}
+        for path in paths:
+            node_path, attribute_name = XmlColumnReader.split_path(path)
+            self.__values[path] = []
+            if not XmlColumnReader.__SIMPLE_NODE_PATH.fullmatch(node_path):
+                self.__searched.append((path, node_path, attribute_name))
+                continue
+            current = self.__step_tree
+            for step in node_path.split("/")[1:]:
+                current = current.setdefault(step, {})
+            current.setdefault(None, [])
+            self.__walked.append((path, current, attribute_name))
+
+    def read(self, list_node: ElemTree.Element) -> None:
+        """
+        Reads all nodes of the given list
+
+        :param list_node: the node which contains the list of nodes eg. the node which is equivalent to the root of the
+                          paths
+        """
+        for path, node_path, attribute_name in self.__searched:
+            self.__values[path].extend(self.__values_of(list_node.findall(".{}".format(node_path)), attribute_name))
+        for node in list_node:
+            self.__walk(node)
+
+    def add(self, node: ElemTree.Element) -> None:
+        """
+        Reads the given node as the next node of the list. This allows to read the list node by node without holding
+        the whole list
+
+        :param node: the node of the list to read
+        """
+        if self.__searched:
+            wrapper = ElemTree.Element("")
+            wrapper.append(node)
+            for path, node_path, attribute_name in self.__searched:
+                self.__values[path].extend(self.__values_of(wrapper.findall(".{}".format(node_path)), attribute_name))
+        self.__walk(node)
+
+    def get_values(self) -> Dict[str, List[str]]:
+        """
+        Returns the values collected for each path
+
+        :return: a dictionary of each path to all values of the nodes or attributes under it in the order of the nodes
+        """
+        for path, values in self.__values.items():
+            if len(values) < 1:
+                raise AssertionError("Path '.{} yielded no results".format(XmlColumnReader.split_path(path)[0]))
+        return self.__values
+
+    def __walk(self, node: ElemTree.Element) -> None:
+        """
+        Collects the values of the simple paths in the given list node
+        """
+        def collect(current: ElemTree.Element, position: int, sub_tree: Dict[str, dict]) -> None:
+            """
+            Collects the given node if a path ends with it and walks its children which are addressed by a step of the
+            given tree in document order
+            """
+            for step in (current.tag, "{}[{}]".format(current.tag, position)):
+                child_tree = sub_tree.get(step)
+                if child_tree is None:
+                    continue
+                if None in child_tree:
+                    child_tree[None].append(current)
+                positions: Dict[str, int] = {}
+                for child_node in current:
+                    # a positional step counts the siblings with the same name only
+                    positions[child_node.tag] = positions.get(child_node.tag, 0) + 1
+                    collect(child_node, positions[child_node.tag], child_tree)
+
+        self.__positions[node.tag] = self.__positions.get(node.tag, 0) + 1
+        collect(node, self.__positions[node.tag], self.__step_tree)
+        for path, sub_tree, attribute_name in self.__walked:
+            self.__values[path].extend(self.__values_of(sub_tree[None], attribute_name))
+        # the node has been read -> don't keep it alive
+        for _, sub_tree, _ in self.__walked:
+            sub_tree[None] = []
+
+    @staticmethod
+    def __values_of(nodes: List[ElemTree.Element], attribute_name: str) -> List[str]:
+        """
+        Returns the texts of the given nodes or their attribute of the given name if there's one
+        """
+        if attribute_name is None:
+            return [node.text for node in nodes]
+        return [node.attrib[attribute_name] for node in nodes]
+
+    @staticmethod
+    def split_path(path: str) -> Tuple[str, str]:
+        """
+        Splits the given path into the path to the nodes relative to the list node and the name of the attribute
+
+        :param path: the path to split
+        :return: a tuple of the node path (starting with a "/") and the attribute name or None if the path addresses
+                 the node text
+        """
+        result = re.search(r"(?<=@)\w*$", path)
+        # cut away the root node
+        node_path = path[path.index("/"):]
+        if result is None:
+            return node_path, None
+        attribute_name = result.group(0)
+        # -1 for the "@" and -1 for the "/" before it
+        return node_path[:-(len(attribute_name) + 2)], attribute_name
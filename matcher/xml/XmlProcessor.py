@@ -1,22 +1,41 @@
 from __future__ import annotations
-from typing import List, Tuple, Dict, Iterator, Set
+from typing import List, Tuple, Dict, Iterator, Set, Callable
 import re
 import xml.etree.ElementTree as ElemTree
 import os
 from xml.dom import minidom
 import copy
+import io
 
-from classifier.PathClassifier import PathClassifier
-from matcher.clustering.ValueNamePair import ValueNamePair
+from classifier.BinClassifier import PathClassifier
+from matcher.clustering.PairColumn import PairColumn
+from matcher.xml.XmlColumnReader import XmlColumnReader
 from matcher.xml.generation.GeneratorCluster import GeneratorStruct, PathCluster, ValuePathStruct
 from creation.FileSystem import create_directories_for
 
 
 class XmlProcessor:
 
+    STREAMING_KEY = "xml_streaming"
+    # the target of the processing instruction which marks where the generated nodes go -> the template can't hold
+    # one as the parser drops them
+    __MARKER_TARGET = "generated-nodes"
+
+    class _StreamedList:
+        """
+        Works as a container for the state of reading one list of nodes node by node
+        """
+        requested: List[Tuple[str, bool]]
+        reader: XmlColumnReader
+        identifier_list: List[str]
+
+        def __init__(self):
+            self.requested = []
+            self.reader = None
+            self.identifier_list = []
+
     __classifier: PathClassifier
     __config: Dict[str, str]
-    __targets: List[(str, List[ValueNamePair])]
     __source_path: str
     __name_nodes: Set[str]
     __template_path: str
@@ -30,41 +49,37 @@ class XmlProcessor:
         """
         self.__classifier = sink
         self.__config = config
-        self.__targets = []
         self.__source_path = ""
         self.__name_nodes = set()
 
-    def __iter__(self) -> XmlProcessor:
-        return self
-
-    def __next__(self) -> List[ValueNamePair]:
-        # use a stack scheme as order is not relevant for the clustering
-        # -> switch to a generator in a "proper" implementation
-        try:
-            current: Tuple[str, List[ValueNamePair]] = self.__targets.pop()
-            if not len(current[1]):
-                raise AssertionError("Should not register path '{}' without any value-name pairs".format(current[0]))
-            self.__classifier.add_source_path(self._replace_indexes(current[0]))
-            return current[1]
-        except IndexError:
-            raise StopIteration
-
-    def read_xml(self, path_to_source: str) -> Iterator[List[(str, str)]]:
+    def read_xml(self, path_to_source: str) -> Iterator[PairColumn]:
         """
-        Performs the parsing process of the given XML and prepares a list of value-name pair lists that can be pulled
-        from the returned iterator
+        Performs the parsing process of the given XML and returns a generator of the value-name pair lists. A list is
+        only created when it is pulled and the classifier is told the path of a list right before the list is handed
+        out
 
         :param path_to_source: the path to the xml file to read from (for clustering)
         :return: an iterator returning lists of value-name pairs list by list
         """
         self.__source_path = path_to_source
+        if self.__config.get(self.STREAMING_KEY, False):
+            # for files too large to be held in memory as a whole
+            return self.__stream_xml_master_nodes(self.__source_path)
         tree = ElemTree.parse(self.__source_path)
-        root = tree.getroot()
-        for node in self._get_main_node_names():
+        return self.__generate_pairs(tree.getroot())
+
+    def __generate_pairs(self, root: ElemTree.Element) -> Iterator[PairColumn]:
+        """
+        Processes the lists of the given tree one after another while the pairs of the former are pulled
+
+        :param root: the root node of the source file
+        :return: a generator of the value-name pair lists
+        """
+        # hand out the lists in the reverse order of the config as the former stack of pairs did -> keeps the order
+        # in which the classifier learns the paths
+        for node in reversed(self._get_main_node_names()):
             list_root = root.findall(".//{}".format(node))[0]
-            self._process_xml_master_nodes(list_root)
-        # advertise instance as iterator for lists of value-name-pairs
-        return self
+            yield from self._process_xml_master_nodes(list_root)
 
     def build_template(self, source_path: str, template_path: str) -> None:
         """
@@ -73,23 +88,14 @@ class XmlProcessor:
         :param source_path: the path to the file to condense
         :param template_path: the path to the file where to write the result to
         """
-        def remove_if_multiple_exist(node: ElemTree.Element) -> None:
-            for sub_node in node:
-                # first check the child nodes
-                remove_if_multiple_exist(sub_node)
-            needs_removal = self._has_same_name_children(node)
-            if not needs_removal:
-                return
-            sub_nodes = list(node)
-            # this will iterate over all child nodes except the first one in reverse order
-            for i in range(len(sub_nodes) - 1, 0, -1):
-                node.remove(sub_nodes[i])
-
-        tree = ElemTree.parse(source_path)
-        root = tree.getroot()
-        for main_node in self._get_main_node_names():
-            list_root = root.findall(".//{}".format(main_node))[0]
-            remove_if_multiple_exist(list_root)
+        if self.__config.get(self.STREAMING_KEY, False):
+            tree = self.__stream_template(source_path)
+        else:
+            tree = ElemTree.parse(source_path)
+            root = tree.getroot()
+            for main_node in self._get_main_node_names():
+                list_root = root.findall(".//{}".format(main_node))[0]
+                self.__remove_if_multiple_exist(list_root)
         self.__template_path = template_path
         create_directories_for(template_path)
         # tree.write(template_path)
@@ -105,12 +111,8 @@ class XmlProcessor:
         :param path_pairs: the data to fill the template with
         :return: the number of nodes inserted into the final file
         """
-        def contains_index(to_check: str) -> bool:
-            """
-            Returns if the index identifier can be found in the given string
-            """
-            return "[i]" in to_check
-
+        if self.__config.get(self.STREAMING_KEY, False):
+            return self.__stream_xml(target_file, template_path, path_pairs)
         tree = ElemTree.parse(template_path)
         root = tree.getroot()
         insert_count = []
@@ -119,15 +121,7 @@ class XmlProcessor:
             # all entries represent the same type so just pick the first
             node_template = self.__copy_template_and_delete(root, xml_classes[0].base_path)
             for entry in xml_classes:
-                # use the first node as template -> create a working copy: modify it and append it to the existing nodes
-                working_copy = copy.deepcopy(node_template)
-                name_node = self.__first_node_of(working_copy, self.__remove_first_two_nodes(entry.name_path))
-                name_node.text = entry.name
-                for path_struct in entry.value_path_pairs:
-                    if contains_index(path_struct.path):
-                        self.__set_values_on(working_copy, path_struct)
-                    else:
-                        self.__set_depending_on_path(working_copy, path_struct.path, path_struct.values[0])
+                working_copy = self.__fill_template(node_template, entry)
                 # insert the copy
                 current_root = self.__first_node_of(root, self.__path_of_parent(entry.base_path))
                 current_root.append(working_copy)
@@ -138,6 +132,77 @@ class XmlProcessor:
             print(self.__prettify(tree), file=file)
         return sum(insert_count)
 
+    def __stream_xml(self, target_file: str, template_path: str, path_pairs: List[List[PathCluster]]) -> int:
+        """
+        Does the same as write_xml but writes the nodes one by one into the file instead of building the whole tree
+        first: only the template and the node currently written are held in memory
+
+        :param target_file: the path under which the result is to store
+        :param template_path: the path to the template file
+        :param path_pairs: the data to fill the template with
+        :return: the number of nodes inserted into the final file
+        """
+        tree = ElemTree.parse(template_path)
+        root = tree.getroot()
+        # the template of the nodes and the cluster to fill it with per marker
+        nodes_of: List[List[Tuple[ElemTree.Element, PathCluster]]] = []
+        # id of a parent node -> the index of the marker placed in it
+        markers: Dict[int, int] = {}
+        for xml_classes in path_pairs:
+            # all entries represent the same type so just pick the first
+            node_template = self.__copy_template_and_delete(root, xml_classes[0].base_path)
+            parents: Dict[str, ElemTree.Element] = {}
+            for entry in xml_classes:
+                parent_path = self.__path_of_parent(entry.base_path)
+                if parent_path not in parents:
+                    parents[parent_path] = self.__first_node_of(root, parent_path)
+                parent = parents[parent_path]
+                if id(parent) not in markers:
+                    # mark the place the nodes are appended at in the template
+                    markers[id(parent)] = len(nodes_of)
+                    nodes_of.append([])
+                    parent.append(ElemTree.ProcessingInstruction(self.__MARKER_TARGET, str(markers[id(parent)])))
+                nodes_of[markers[id(parent)]].append((node_template, entry))
+        marker_line = re.compile(r"(\s*)<\?{} (\d+)\?>".format(self.__MARKER_TARGET))
+        count = 0
+        create_directories_for(target_file)
+        with open(target_file, "w") as file:
+            for line in self.__prettify(tree).split("\n"):
+                marker = marker_line.fullmatch(line)
+                if marker is None:
+                    print(line, file=file)
+                    continue
+                # the nodes take the place (and the indentation) of their marker
+                for node_template, entry in nodes_of[int(marker.group(2))]:
+                    print(self.__prettify_node(self.__fill_template(node_template, entry), marker.group(1)), file=file)
+                    count += 1
+        return count
+
+    def __fill_template(self, node_template: ElemTree.Element, entry: PathCluster) -> ElemTree.Element:
+        """
+        Creates a copy of the given node template which holds the name and the values of the given cluster
+
+        :param node_template: the node to copy
+        :param entry: the cluster to fill the copy with
+        :return: the filled copy
+        """
+        def contains_index(to_check: str) -> bool:
+            """
+            Returns if the index identifier can be found in the given string
+            """
+            return "[i]" in to_check
+
+        # use the first node as template -> create a working copy and modify it
+        working_copy = copy.deepcopy(node_template)
+        name_node = self.__first_node_of(working_copy, self.__remove_first_two_nodes(entry.name_path))
+        name_node.text = entry.name
+        for path_struct in entry.value_path_pairs:
+            if contains_index(path_struct.path):
+                self.__set_values_on(working_copy, path_struct)
+            else:
+                self.__set_depending_on_path(working_copy, path_struct.path, path_struct.values[0])
+        return working_copy
+
     def group_target_paths(self, unsorted_paths: List[str]) -> List[GeneratorStruct]:
         """
         Groups the given paths into classes in form of GeneratorStructs and assigns them these classes. The function
@@ -148,49 +213,63 @@ class XmlProcessor:
         """
         return GeneratorStruct.construct_from(self.__name_nodes, unsorted_paths)
 
-    def _process_xml_master_nodes(self, parent_node: ElemTree.Element) -> None:
+    def _process_xml_master_nodes(self, parent_node: ElemTree.Element) -> Iterator[PairColumn]:
         """
         Goes through the child list of the given node and treats them as master: meaning that the classifier will treat
         the xlsx as slave where the values from the xml has to be found in
 
         :param parent_node: the node which contains the list of nodes to match with the xlsx
-        :return:
+        :return: a generator of the value-name pair lists of the list
+        """
+        # get an overview about the targets to find
+        identifier_list = list(map(lambda x: x.text, parent_node.findall(".//{}".format(self._get_universal_id()))))
+        if len(identifier_list) < 1:
+            raise AssertionError("No name extracted! Maybe wrong URI value in config file: " + self._get_universal_id())
+        # use the first node as blue-print
+        requested = self.__request_paths_of(parent_node[0], parent_node.tag)
+        # resolve all paths at once which walks the list of nodes only once instead of once per path
+        reader = XmlColumnReader([x[0] for x in requested])
+        reader.read(parent_node)
+        yield from self.__pairs_of(requested, reader.get_values(), identifier_list)
+
+    def __request_paths_of(self, blueprint: ElemTree.Element, list_name: str) -> List[Tuple[str, bool]]:
+        """
+        Walks the given node of a list and determines the paths of all values it offers for the matching
+
+        :param blueprint: the node which serves as blue-print for all nodes of the list
+        :param list_name: the name of the node holding the list
+        :return: the paths and if they address a node text (else an attribute) in the order found
         """
-        def process_attributes(node: ElemTree.Element, current_path: str, ids: List[str]) -> None:
+        def process_attributes(node: ElemTree.Element, current_path: str) -> None:
             """
             Forwards the given attributes and their name to the function which tries to come up with matches
 
             :param node: the node which hosts the attributes
             :param current_path: the path to current node
-            :param ids: the list of URI of all devices
             """
             for key in node.attrib.keys():
-                new_path = current_path + "/@{}".format(key)
-                values = self._path_to_xml_values(new_path, parent_node)
-                self.__targets.append((new_path, ValueNamePair.zip(values, ids)))
+                requested.append((current_path + "/@{}".format(key), False))
 
-        def iterate_by_index(node: ElemTree.Element, current_path: str, ids: List[str]) -> None:
+        def iterate_by_index(node: ElemTree.Element, current_path: str) -> None:
             """
             Iterates through the child nodes of the given node supported by an index which is useful if all nodes carry
             the same name
 
             :param node: the node of which the children shall be analyzed
             :param current_path: the current path for the classifier
-            :param ids: the list of URIs
             """
             # the indexing starts with 1: https://docs.python.org/3.8/library/xml.etree.elementtree.html#example
             child_index = 1
             for child_node in node:
-                process_node(child_node, current_path + "/{}[{}]".format(child_node.tag, child_index), ids)
+                process_node(child_node, current_path + "/{}[{}]".format(child_node.tag, child_index))
                 child_index += 1
 
-        def iterate_by_name(node: ElemTree.Element, current_path: str, ids: List[str]) -> None:
+        def iterate_by_name(node: ElemTree.Element, current_path: str) -> None:
             """
             Iterates over the children of the node assuming that they're all unique in their name under their siblings
 
             :param node: the node of which the children shall be analyzed
             :param current_path: the current path for the classifier
-            :param ids: the list of URIs
             """
             for child_node in node:
                 name = child_node.tag
@@ -200,38 +279,183 @@ class XmlProcessor:
                     self.__name_nodes.add(name_path)
                     # makes no sense to search for pairs of the same two names
                     continue
-                process_node(child_node, current_path + "/{}".format(name), ids)
+                process_node(child_node, current_path + "/{}".format(name))
 
-        def process_node(node: ElemTree.Element, current_path: str, ids: List[str]) -> None:
+        def process_node(node: ElemTree.Element, current_path: str) -> None:
             """
             Checks the given node for a value and attributes and forwards them to the function clustering them to their
             counterpart in the xlsx. If the node contains child-nodes it processes recursively
 
             :param node: the node to extract the data (and children) from
             :param current_path: the path to the current node
-            :param ids: the list of URI of all devices
             """
             if not node.text.isspace():
-                values = self._path_to_xml_values(current_path, parent_node)
-                if len(values) == len(ids):
-                    # if not enough values are available a meaningful clustering is not possible anymore
-                    self.__targets.append((current_path, ValueNamePair.zip(values, ids)))
+                requested.append((current_path, True))
             if node.attrib:
-                process_attributes(node, current_path, ids)
+                process_attributes(node, current_path)
             needs_indexing = XmlProcessor._has_same_name_children(node)
             # continue with going down deeper the tree -> if things get more complicated wrap these in separate
             # functions
             if needs_indexing:
-                iterate_by_index(node, current_path, ids)
+                iterate_by_index(node, current_path)
             else:
-                iterate_by_name(node, current_path, ids)
+                iterate_by_name(node, current_path)
 
-        # get an overview about the targets to find
-        identifier_list = list(map(lambda x: x.text, parent_node.findall(".//{}".format(self._get_universal_id()))))
-        if len(identifier_list) < 1:
-            raise AssertionError("No name extracted! Maybe wrong URI value in config file: " + self._get_universal_id())
-        # use the first node as blue-print
-        process_node(parent_node[0], "{}/{}".format(parent_node.tag, parent_node[0].tag), identifier_list)
+        requested: List[Tuple[str, bool]] = []
+        process_node(blueprint, "{}/{}".format(list_name, blueprint.tag))
+        return requested
+
+    def __pairs_of(self, requested: List[Tuple[str, bool]], values_of: Dict[str, List[str]],
+                   identifier_list: List[str]) -> Iterator[PairColumn]:
+        """
+        Pairs the values of the requested paths with the names of the nodes they belong to path by path
+
+        :param requested: the paths and if they address a node text (else an attribute) in the order found
+        :param values_of: the values of all nodes of the list per path
+        :param identifier_list: the names of all nodes of the list
+        :return: a generator of the value-name pair lists
+        """
+        # the last path found comes first as the former stack of pairs handed them out
+        for path, is_text in reversed(requested):
+            values = values_of[path]
+            if is_text and len(values) != len(identifier_list):
+                # if not enough values are available a meaningful clustering is not possible anymore
+                continue
+            # all paths of the list share the names
+            pairs = PairColumn(values, identifier_list)
+            if not len(pairs):
+                raise AssertionError("Should not register path '{}' without any value-name pairs".format(path))
+            self.__classifier.add_source_path(self._replace_indexes(path))
+            yield pairs
+
+    def __stream_xml_master_nodes(self, source_path: str) -> Iterator[PairColumn]:
+        """
+        Does the same as __generate_pairs but reads the file node by node: only the node of the list currently read is
+        held in memory besides the values collected so far. The pairs are handed out after the whole file is read
+
+        :param source_path: the path to the xml file to read
+        :return: a generator of the value-name pair lists
+        """
+        lists: Dict[str, XmlProcessor._StreamedList] = {}
+
+        def process(list_name: str, node: ElemTree.Element) -> bool:
+            """
+            Adds the values of the given node to the ones of its list
+            """
+            streamed = lists.setdefault(list_name, XmlProcessor._StreamedList())
+            if streamed.reader is None:
+                # use the first node as blue-print
+                streamed.requested = self.__request_paths_of(node, list_name)
+                streamed.reader = XmlColumnReader([x[0] for x in streamed.requested])
+            streamed.identifier_list.extend(x.text for x in node.iter(self._get_universal_id()))
+            streamed.reader.add(node)
+            return False
+
+        self.__stream_lists(source_path, lambda list_name, node: True, process)
+        for list_name in reversed(self._get_main_node_names()):
+            streamed = lists.get(list_name, XmlProcessor._StreamedList())
+            if len(streamed.identifier_list) < 1:
+                raise AssertionError("No name extracted! Maybe wrong URI value in config file: " +
+                                     self._get_universal_id())
+            yield from self.__pairs_of(streamed.requested, streamed.reader.get_values(), streamed.identifier_list)
+
+    def __stream_template(self, source_path: str) -> ElemTree.ElementTree:
+        """
+        Does the same as build_template in purging the lists of the given file but reads it node by node: the nodes
+        which are purged anyway are dropped as soon as they are read
+
+        :param source_path: the path to the file to condense
+        :return: the condensed tree
+        """
+        # the list name -> the name of its first node
+        first_names: Dict[str, str] = {}
+        # the list name -> if all nodes are kept as the first two nodes have different names (see
+        # _has_same_name_children)
+        keep_all: Dict[str, bool] = {}
+
+        def select(list_name: str, node: ElemTree.Element) -> bool:
+            """
+            Tells if the given node which just started in the given list is kept
+            """
+            if list_name not in first_names:
+                first_names[list_name] = node.tag
+                return True
+            if list_name not in keep_all:
+                keep_all[list_name] = first_names[list_name] != node.tag
+            return keep_all[list_name]
+
+        def process(list_name: str, node: ElemTree.Element) -> bool:
+            """
+            Purges the given node which is kept in the template
+            """
+            self.__remove_if_multiple_exist(node)
+            return True
+
+        return ElemTree.ElementTree(self.__stream_lists(source_path, select, process))
+
+    def __stream_lists(self, source_path: str, select: Callable[[str, ElemTree.Element], bool],
+                       process: Callable[[str, ElemTree.Element], bool]) -> ElemTree.Element:
+        """
+        Parses the given file piece by piece and hands each node of the lists named in the config to the given function
+        as soon as it is complete. As in read_xml the first node in the document with the name of a list is taken as
+        the list. Nodes which are not needed anymore are dropped from the tree right away
+
+        :param source_path: the path to the xml file to read
+        :param select: tells by the name of a list and a node of it which just started (only its name and attributes
+                       are read at that point) if the node is of interest. The others are dropped unread
+        :param process: receives the name of the list and each complete node of interest and tells if the node is to be
+                        kept in the tree. It is dropped else unless it is part of the node of another list
+        :return: the root node of the tree made of what has been kept
+        """
+        list_names = self._get_main_node_names()
+        found: Set[str] = set()
+        # the nodes from the root to the current one
+        open_nodes: List[ElemTree.Element] = []
+        # the depth of the nodes and the name of the lists which are currently open
+        open_lists: List[Tuple[int, str]] = []
+        # the depth of the node which is currently dropped unread (0 if there's none)
+        skipped_depth = 0
+        root = None
+        for event, node in ElemTree.iterparse(source_path, events=("start", "end")):
+            if event == "start":
+                open_nodes.append(node)
+                depth = len(open_nodes)
+                if root is None:
+                    root = node
+                if skipped_depth:
+                    continue
+                if open_lists and depth == open_lists[-1][0] and not select(open_lists[-1][1], node):
+                    skipped_depth = depth
+                elif depth > 1 and node.tag in list_names and node.tag not in found:
+                    # like findall(".//") the root is no candidate for a list
+                    found.add(node.tag)
+                    open_lists.append((depth + 1, node.tag))
+                continue
+            depth = len(open_nodes)
+            open_nodes.pop()
+            if skipped_depth:
+                if depth == skipped_depth:
+                    skipped_depth = 0
+                    XmlProcessor.__drop(node, open_nodes[-1])
+                continue
+            if open_lists and depth == open_lists[-1][0]:
+                if not process(open_lists[-1][1], node) and len(open_lists) == 1:
+                    XmlProcessor.__drop(node, open_nodes[-1])
+            elif open_lists and depth == open_lists[-1][0] - 1:
+                # the list itself is complete
+                open_lists.pop()
+        for list_name in list_names:
+            if list_name not in found:
+                raise AssertionError("Found no list node '{}' in '{}'".format(list_name, source_path))
+        return root
+
+    @staticmethod
+    def __drop(node: ElemTree.Element, parent_node: ElemTree.Element) -> None:
+        """
+        Removes the given node from its parent and frees its content
+        """
+        node.clear()
+        parent_node.remove(node)
 
     def _get_universal_id(self):
         """
@@ -251,38 +475,22 @@ class XmlProcessor:
         return raw_list.split(",")
 
     @staticmethod
-    def _path_to_xml_values(path: str, root_node: ElemTree.Element) -> List[str]:
-        """
-        Resolves the given path to the nodes (or their attribute) of interest and returns the list of their values as
-        they appear
-
-        :param path: the path to resolve
-        :param root_node: the node which contains the list of nodes eg. the node which is equivalent to the root of path
-        :return: all values of the nodes or attributes under the given path
-        """
-        # as the path model is similar to XPath: so just use it
-        result = re.search(r"(?<=@)\w*$", path)
-        # cut away the root node
-        root_end = path.index("/")
-        node_path = path[root_end:]
-        values = []
-        if result is None:
-            # means a node has to be processed
-            nodes = root_node.findall(".{}".format(node_path))
-            if len(nodes) < 1:
-                raise AssertionError("Path '.{} yielded no results".format(node_path))
-            for node in nodes:
-                values.append(node.text)
-        else:
-            # means a attribute has to be processed
-            attribute_name = result.group(0)
-            node_path = node_path[:-(len(attribute_name) + 2)]     # -1 for the "@" and -1 for the "/" before it
-            nodes = root_node.findall(".{}".format(node_path))
-            if len(nodes) < 1:
-                raise AssertionError("Path '.{} yielded no results".format(node_path))
-            for node in nodes:
-                values.append(node.attrib[attribute_name])
-        return values
+    def __remove_if_multiple_exist(node: ElemTree.Element) -> None:
+        """
+        Reduces every list under the given node and the node itself to its first child
+
+        :param node: the node to purge
+        """
+        for sub_node in node:
+            # first check the child nodes
+            XmlProcessor.__remove_if_multiple_exist(sub_node)
+        needs_removal = XmlProcessor._has_same_name_children(node)
+        if not needs_removal:
+            return
+        sub_nodes = list(node)
+        # this will iterate over all child nodes except the first one in reverse order
+        for i in range(len(sub_nodes) - 1, 0, -1):
+            node.remove(sub_nodes[i])
 
     @staticmethod
     def _has_same_name_children(to_test: ElemTree.Element) -> bool:
@@ -315,6 +523,22 @@ class XmlProcessor:
         """
         return re.sub(r"\[\d.?]", "[i]", path_str)
 
+    @staticmethod
+    def __prettify_node(node: ElemTree.Element, indent: str) -> str:
+        """
+        Does the same as __prettify for a single node which is placed with the given indentation in the document
+
+        :param node: the node to prettify
+        :param indent: the indentation of the node
+        :return: the lines of the node as they appear in the prettified document
+        """
+        # the text following the node belongs to the parent which only contributes white space to the document
+        node.tail = None
+        restructured = minidom.parseString(ElemTree.tostring(node, encoding='utf-8', method='xml'))
+        writer = io.StringIO()
+        restructured.documentElement.writexml(writer, indent, "  ", "\n")
+        return '\n'.join([line for line in writer.getvalue().split('\n') if line.strip()])
+
     @staticmethod
     def __prettify(elem: ElemTree.ElementTree) -> str:
         """
@@ -0,0 +1,164 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import json
+
+from matcher.xml.generation.GeneratorCluster import GeneratorStruct, ValuePathStruct, PathCluster
+from matcher.xlsx.XlsxProcessor import XlsxProcessor
+from matcher.xlsx.location.SinkPath import SinkPath
+
+
+class GenerationPlan:
+    """
+    Holds everything the generation derives from the trained paths alone: the classes of the source file, where their
+    names are listed and the parsed sink path of each of their nodes. The reads are grouped by the sheet they start at
+    so that the workbooks are worked through one after another
+    """
+
+    __classes: List[GeneratorStruct]
+    __name_paths: List[str]
+    __sink_paths: List[List[SinkPath]]
+    # (file, sheet) -> the class and node index of every sink path starting there
+    __reads: Dict[Tuple[str, str], List[Tuple[int, int]]]
+    # the plan, processor and nested path of the current worker process (if it is one) -> set by the pool initializer
+    __worker: Tuple[GenerationPlan, XlsxProcessor, str] = None
+
+    def __init__(self, classes: List[GeneratorStruct], name_paths: List[str], sink_paths: List[List[SinkPath]]):
+        """
+        The constructor which is discouraged to be used outside of the static factory method
+
+        :param classes: the classes of the source file in the order they are to be generated
+        :param name_paths: the path to the names in the xlsx-files per class
+        :param sink_paths: the parsed sink path per node path of each class
+        """
+        self.__classes = classes
+        self.__name_paths = name_paths
+        self.__sink_paths = sink_paths
+        self.__reads = OrderedDict()
+        for class_index in range(len(sink_paths)):
+            for node_index in range(len(sink_paths[class_index])):
+                sink_path = sink_paths[class_index][node_index]
+                self.__reads.setdefault((sink_path.file, sink_path.sheet), []).append((class_index, node_index))
+
+    def execute(self, xlsx_handler: XlsxProcessor, nested_path: str, workers: int = 1) -> List[List[PathCluster]]:
+        """
+        Reads the names of all classes and the values of all their nodes from the xlsx-files
+
+        :param xlsx_handler: the processor to read the xlsx-files with
+        :param nested_path: the path to use when following a file forwarding
+        :param workers: the number of processes to build the classes in. With more than one each class is built in a
+                        process of its own
+        :return: the clusters of each class in the order of the classes
+        """
+        # fix the order of the names here as it decides the order of the nodes in the generated file
+        names = [list(xlsx_handler.get_names(x)) for x in self.__name_paths]
+        if workers > 1 and len(self.__classes) > 1:
+            return self.__execute_in_parallel(xlsx_handler, nested_path, names, workers)
+        values: List[List[Dict[str, List[str]]]] = [[None] * len(x) for x in self.__sink_paths]
+        for reads in self.__reads.values():
+            for class_index, node_index in reads:
+                values[class_index][node_index] = xlsx_handler.receive_for_sink_path_batch(
+                    self.__sink_paths[class_index][node_index], names[class_index], nested_path)
+        return [self.__build_clusters(x, names[x], values[x]) for x in range(len(self.__classes))]
+
+    def __execute_in_parallel(self, xlsx_handler: XlsxProcessor, nested_path: str, names: List[List[str]],
+                              workers: int) -> List[List[PathCluster]]:
+        """
+        Builds the clusters of each class in a worker process. The results are collected in the order of the classes
+        so that the outcome does not differ from the serial execution
+
+        :param xlsx_handler: the processor to read the xlsx-files with
+        :param nested_path: the path to use when following a file forwarding
+        :param names: the names of each class
+        :param workers: the number of processes to build the classes in
+        :return: the clusters of each class in the order of the classes
+        """
+        tasks = [(x, names[x]) for x in range(len(self.__classes))]
+        with ProcessPoolExecutor(min(workers, len(tasks)), initializer=GenerationPlan._init_worker,
+                                 initargs=(self, xlsx_handler.create_worker(), nested_path)) as pool:
+            # map() returns the results in the order of the tasks no matter which worker finished first
+            return list(pool.map(GenerationPlan._execute_in_worker, tasks))
+
+    @staticmethod
+    def _init_worker(plan: GenerationPlan, xlsx_handler: XlsxProcessor, nested_path: str) -> None:
+        """
+        Stores what the current worker process shall build the classes with
+        """
+        GenerationPlan.__worker = (plan, xlsx_handler, nested_path)
+
+    @staticmethod
+    def _execute_in_worker(task: Tuple[int, List[str]]) -> List[PathCluster]:
+        """
+        Builds the clusters of one class inside a worker process
+
+        :param task: the tuple of the index of the class and its names
+        :return: the clusters of the class
+        """
+        plan, xlsx_handler, nested_path = GenerationPlan.__worker
+        class_index, names = task
+        values: List[Dict[str, List[str]]] = [None] * len(plan.__sink_paths[class_index])
+        # keep the order of the reads within the class
+        for reads in plan.__reads.values():
+            for read_class, node_index in reads:
+                if read_class == class_index:
+                    values[node_index] = xlsx_handler.receive_for_sink_path_batch(
+                        plan.__sink_paths[class_index][node_index], names, nested_path)
+        return plan.__build_clusters(class_index, names, values)
+
+    def __build_clusters(self, class_index: int, names: List[str],
+                         values: List[Dict[str, List[str]]]) -> List[PathCluster]:
+        """
+        Assembles the clusters of one class from the values read for each of its nodes
+
+        :param class_index: the index of the class
+        :param names: the names of the class in the order the clusters shall have
+        :param values: the values per name for each node of the class
+        :return: one cluster per name
+        """
+        target_class = self.__classes[class_index]
+        clusters = []
+        for name in names:
+            current = PathCluster(name, target_class.name_path, target_class.root_path)
+            for node_path, node_values in zip(target_class.node_paths, values):
+                current.add_pair(ValuePathStruct(name, node_values[name], node_path))
+            clusters.append(current)
+        return clusters
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Returns the plan in a JSON compatible form
+        """
+        classes = []
+        for class_index in range(len(self.__classes)):
+            target_class = self.__classes[class_index]
+            classes.append({
+                "root_path": target_class.root_path,
+                "name_path": target_class.name_path,
+                "xlsx_name_path": self.__name_paths[class_index],
+                "nodes": [{"source_path": x, "sink_path": y.to_dict()}
+                          for x, y in zip(target_class.node_paths, self.__sink_paths[class_index])]
+            })
+        reads = [{"file": x[0], "sheet": x[1], "nodes": [list(z) for z in y]} for x, y in self.__reads.items()]
+        return {"classes": classes, "reads": reads}
+
+    def to_json(self, sort_keys=False, indent=2) -> str:
+        return json.dumps(self.to_dict(), sort_keys=sort_keys, indent=indent)
+
+    @staticmethod
+    def compile(target_classes: List[GeneratorStruct], name_paths: List[str], path_dict: Dict[str, str],
+                xlsx_handler: XlsxProcessor) -> GenerationPlan:
+        """
+        Parses the sink paths of all node paths of the given classes once
+
+        :param target_classes: the classes of the source file with their ordered node paths
+        :param name_paths: the path to the names in the xlsx-files per class
+        :param path_dict: the trained paths as source path to sink path
+        :param xlsx_handler: the processor which parses the sink paths
+        :return: the plan to generate the classes with
+        """
+        if len(target_classes) != len(name_paths):
+            raise ValueError("Expected a name path for each of the {} classes but received {}".format(
+                len(target_classes), len(name_paths)))
+        sink_paths = [[xlsx_handler.compile_path(path_dict[y]) for y in x.node_paths] for x in target_classes]
+        return GenerationPlan(target_classes, name_paths, sink_paths)
@@ -0,0 +1,56 @@
+import random
+from typing import Callable, Dict, Tuple
+
+import pytest
+import toml
+
+from creation.Creator import Creator
+from creation.SectionCreator import SectionCreator
+from creation.WorkerCreator import WorkerCreator
+from matcher.MatchingManager import MatchingManager
+
+
+@pytest.fixture(scope="module")
+def training_data(tmp_path_factory) -> str:
+    """
+    Writes the files of a small generated company: the reference XML, the xlsx-files and the config
+
+    :return: the directory holding the files
+    """
+    directory = str(tmp_path_factory.mktemp("company"))
+    random.seed(7)
+    with open(directory + "/workers.json", "w") as file:
+        file.write(WorkerCreator(20).to_json())
+    with open(directory + "/sections.json", "w") as file:
+        file.write(SectionCreator().to_json())
+    creator = Creator(path_to_workers=directory + "/workers.json", path_to_sections=directory + "/sections.json")
+    creator.create_xlsx(directory, "data.xlsx", "sections")
+    creator.create_xml(directory + "/ref.xml")
+    creator.create_config_file(directory + "/config.toml")
+    return directory
+
+
+@pytest.fixture
+def run_matching(training_data, monkeypatch) -> Callable[..., Tuple[Dict[str, str], str, str]]:
+    """
+    Returns a function which trains on the generated company and generates the XML anew. The keyword arguments given
+    to it are added to the config. It returns the trained paths, the template and the generated XML
+    """
+    # the paths the classifier learns are relative to the working directory
+    monkeypatch.chdir(training_data)
+    with open("config.toml") as file:
+        config = toml.load(file)
+
+    def run(**settings) -> Tuple[Dict[str, str], str, str]:
+        name = "_".join("{}_{}".format(x, y) for x, y in sorted(settings.items())) or "default"
+        with open("config_{}.toml".format(name), "w") as file:
+            toml.dump(dict(config, **settings), file)
+        manager = MatchingManager("config_{}.toml".format(name), "log/{}.log".format(name))
+        manager.train("ref.xml", "data.xlsx", "sections/")
+        manager.create_build_environment("template/{}.xml".format(name))
+        # an empty result would match anyway
+        assert manager.generate("result_{}.xml".format(name)) > 0
+        with open("template/{}.xml".format(name)) as template, open("result_{}.xml".format(name)) as result:
+            return manager.get_trained_paths(), template.read(), result.read()
+
+    return run
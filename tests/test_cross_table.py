@@ -0,0 +1,44 @@
+import pytest
+from openpyxl import Workbook
+
+from matcher.xlsx.XlsxProcessor import XlsxProcessor
+
+# the values are found in row 2, the names in column A and the markers right of the names
+CROSS_PATH = "data.xlsx/Roles/@B3;B$2;$A3"
+
+
+def create_cross_table(path: str, with_total: bool) -> str:
+    """
+    Writes a cross table associating alice with v1 and v3 and bob with v2. Optionally a row of numbers summing up the
+    markers follows the names
+    """
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Roles"
+    sheet.append(["roles"])
+    sheet.append([None, "v1", "v2", "v3"])
+    sheet.append(["alice", "x", None, "x"])
+    sheet.append(["bob", None, "x", None])
+    if with_total:
+        sheet.append(["total", 1, 1, 1])
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize("with_total", [False, True])
+def test_names_are_associated_with_their_marked_values(tmp_path, monkeypatch, with_total):
+    # the paths of the classifier are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    path = create_cross_table("data.xlsx", with_total)
+    processor = XlsxProcessor(None, {}, path)
+    result = processor.receive_for_path_batch(CROSS_PATH, ["alice", "bob"])
+    assert result == {"alice": ["v1", "v3"], "bob": ["v2"]}
+
+
+def test_only_the_name_of_a_line_which_is_not_text_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = create_cross_table("data.xlsx", True)
+    processor = XlsxProcessor(None, {}, path)
+    with pytest.raises(TypeError):
+        processor.receive_for_path(CROSS_PATH, "total")
+    assert processor.receive_for_path(CROSS_PATH, "bob") == ["v2"]
@@ -0,0 +1,38 @@
+from matcher.MatchingManager import MatchingManager
+from matcher.xml.XmlProcessor import XmlProcessor
+
+
+def test_training_workers_learn_what_the_serial_training_learns(run_matching):
+    paths, _, result = run_matching()
+    parallel_paths, _, parallel_result = run_matching(**{MatchingManager.TRAINING_WORKERS_KEY: 2})
+    assert len(paths) > 0
+    assert parallel_paths == paths
+    assert parallel_result == result
+
+
+def test_batch_matching_learns_what_the_matching_per_list_learns(run_matching):
+    paths, _, result = run_matching()
+    batch_paths, _, batch_result = run_matching(**{MatchingManager.BATCH_MATCHING_KEY: True})
+    assert len(paths) > 0
+    assert batch_paths == paths
+    assert batch_result == result
+
+
+def test_generation_workers_write_what_the_serial_generation_writes(run_matching):
+    _, _, result = run_matching()
+    _, _, parallel_result = run_matching(**{MatchingManager.GENERATION_WORKERS_KEY: 2})
+    assert parallel_result == result
+
+
+def test_streaming_reads_what_the_parsed_source_holds(run_matching):
+    paths, template, _ = run_matching()
+    streamed_paths, streamed_template, _ = run_matching(**{XmlProcessor.STREAMING_KEY: True})
+    assert len(paths) > 0
+    assert streamed_paths == paths
+    assert streamed_template == template
+
+
+def test_streaming_writes_what_the_built_tree_holds(run_matching):
+    _, _, result = run_matching()
+    _, _, streamed_result = run_matching(**{XmlProcessor.STREAMING_KEY: True})
+    assert streamed_result == result
@@ -0,0 +1,34 @@
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill
+
+from matcher.xlsx.snapshot.SheetSnapshot import SheetSnapshot
+
+
+def test_size_is_trimmed_to_the_cells_in_use():
+    sheet = Workbook().active
+    sheet["A1"] = "name"
+    sheet["B2"] = "alice"
+    # formatting which leaves the cell looking empty does not count
+    sheet.cell(500, 30).font = Font(bold=True)
+    snapshot = SheetSnapshot.from_worksheet(sheet)
+    # one empty line is kept after the cells in use
+    assert (snapshot.max_row, snapshot.max_column) == (3, 3)
+    assert snapshot.cell(2, 2).value == "alice"
+
+
+def test_fills_and_merged_ranges_are_in_use():
+    sheet = Workbook().active
+    sheet["A1"] = "name"
+    sheet["D7"].fill = PatternFill("solid", fgColor="FF00FF00")
+    sheet.merge_cells("B9:C9")
+    snapshot = SheetSnapshot.from_worksheet(sheet)
+    # the sheet ends with the cells in use -> there's no empty line to keep
+    assert (snapshot.max_row, snapshot.max_column) == (9, 4)
+    assert snapshot.cell(7, 4).color == "FF00FF00"
+    assert snapshot.merged_span(9, 2) == 2
+
+
+def test_empty_sheet_keeps_one_cell():
+    snapshot = SheetSnapshot.from_worksheet(Workbook().active)
+    assert (snapshot.max_row, snapshot.max_column) == (1, 1)
+    assert snapshot.cell(1, 1).value is None
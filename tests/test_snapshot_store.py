@@ -0,0 +1,181 @@
+import glob
+import json
+import logging
+import os
+from decimal import Decimal
+from typing import Callable, List
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+from openpyxl.worksheet.formula import ArrayFormula, DataTableFormula
+
+from matcher.xlsx.cache.SnapshotStore import SnapshotStore
+from matcher.xlsx.cache.WorkbookCache import WorkbookCache
+from matcher.xlsx.snapshot.SheetSnapshot import WorkbookSnapshot, SheetSnapshot
+
+
+def create_workbook(path: str) -> str:
+    """
+    Writes a small workbook with one table to the given path
+    """
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Workers"
+    sheet.append(["name", "age"])
+    sheet.append(["alice", 31])
+    sheet.append(["bob", 42])
+    wb.save(path)
+    return path
+
+
+class CountingParser:
+    """
+    Loads workbooks like the default parser of the store (or the loader given) but counts how often it is asked to
+    """
+
+    def __init__(self, loader: Callable[[str], WorkbookSnapshot] = WorkbookSnapshot.load):
+        self.calls = 0
+        self.loader = loader
+
+    def __call__(self, path: str) -> WorkbookSnapshot:
+        self.calls += 1
+        return self.loader(path)
+
+
+def parse_as(contents: List[object]) -> Callable[[str], WorkbookSnapshot]:
+    """
+    Returns a loader which ignores the file and delivers a sheet holding the given contents in its only row
+    """
+    def parse(path: str) -> WorkbookSnapshot:
+        row = [(x, SheetSnapshot.DEFAULT_COLOR) for x in contents]
+        return WorkbookSnapshot([SheetSnapshot.from_rows("Contents", 1, len(contents), [row], [])])
+    return parse
+
+
+def read_meta(store_dir: str) -> dict:
+    meta_files = glob.glob(os.path.join(store_dir, "*", SnapshotStore.META_FILE))
+    assert len(meta_files) == 1
+    with open(meta_files[0], "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def write_meta(store_dir: str, meta: dict) -> None:
+    meta_file = glob.glob(os.path.join(store_dir, "*", SnapshotStore.META_FILE))[0]
+    with open(meta_file, "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+
+
+def test_unchanged_file_is_parsed_once(tmp_path):
+    source = create_workbook(str(tmp_path / "data.xlsx"))
+    parser = CountingParser()
+    store = SnapshotStore(str(tmp_path / "store"), parser)
+    first = store.load(source)
+    second = store.load(source)
+    assert parser.calls == 1
+    assert first["Workers"].cell(3, 1).value == second["Workers"].cell(3, 1).value == "bob"
+
+
+def test_entry_of_other_version_is_replaced(tmp_path):
+    source = create_workbook(str(tmp_path / "data.xlsx"))
+    store_dir = str(tmp_path / "store")
+    parser = CountingParser()
+    store = SnapshotStore(store_dir, parser)
+    store.load(source)
+    meta = read_meta(store_dir)
+    meta["version"] = SnapshotStore.FORMAT_VERSION - 1
+    write_meta(store_dir, meta)
+    for _ in range(3):
+        store.load(source)
+    # the outdated entry is parsed once more and stored anew: afterwards it is used again
+    assert parser.calls == 2
+    assert read_meta(store_dir)["version"] == SnapshotStore.FORMAT_VERSION
+
+
+def load_untrimmed(path: str) -> WorkbookSnapshot:
+    """
+    Loads the workbook in the size openpyxl declares for its sheets like the snapshots of format version 1 did
+    """
+    workbook = load_workbook(path)
+    sheets = []
+    for sheet in (workbook[x] for x in workbook.sheetnames):
+        rows = (((cell.value, cell.fill.start_color.index) for cell in row) for row in sheet.iter_rows())
+        merged = ((x.min_row, x.min_col, x.max_row, x.max_col) for x in sheet.merged_cells.ranges)
+        sheets.append(SheetSnapshot.from_rows(sheet.title, sheet.max_row, sheet.max_column, rows, merged))
+    workbook.close()
+    return WorkbookSnapshot(sheets)
+
+
+def test_untrimmed_entry_of_version_1_is_upgraded(tmp_path, monkeypatch):
+    source = str(tmp_path / "data.xlsx")
+    create_workbook(source)
+    wb = load_workbook(source)
+    # only formatted -> openpyxl counts the cell but the trimmed snapshot does not
+    wb["Workers"].cell(500, 30).font = Font(bold=True)
+    wb.save(source)
+    store_dir = str(tmp_path / "store")
+    with monkeypatch.context() as patch:
+        patch.setattr(SnapshotStore, "FORMAT_VERSION", 1)
+        SnapshotStore(store_dir, load_untrimmed).load(source)
+    assert read_meta(store_dir)["sheets"][0]["max_row"] == 500
+    parser = CountingParser()
+    store = SnapshotStore(store_dir, parser)
+    upgraded = store.load(source)
+    assert parser.calls == 1
+    assert (upgraded["Workers"].max_row, upgraded["Workers"].max_column) == (4, 3)
+    meta = read_meta(store_dir)
+    assert meta["version"] == SnapshotStore.FORMAT_VERSION
+    assert (meta["sheets"][0]["max_row"], meta["sheets"][0]["max_column"]) == (4, 3)
+    # from now on the trimmed entry is used
+    reloaded = store.load(source)
+    assert parser.calls == 1
+    assert reloaded["Workers"].max_row == 4
+    assert reloaded["Workers"].cell(3, 2).value == 42
+
+
+def test_formulas_and_decimals_are_stored(tmp_path):
+    source = create_workbook(str(tmp_path / "data.xlsx"))
+    table = DataTableFormula("B1:B2", dt2D="1", r1="C1", r2="C2")
+    parser = CountingParser(parse_as([Decimal("1.25"), ArrayFormula("A1:A2", "=A3:A4*2"), table]))
+    store = SnapshotStore(str(tmp_path / "store"), parser)
+    store.load(source)
+    stored = store.load(source)["Contents"]
+    assert parser.calls == 1
+    assert stored.cell(1, 1).value == Decimal("1.25")
+    assert (stored.cell(1, 2).value.ref, stored.cell(1, 2).value.text) == ("A1:A2", "=A3:A4*2")
+    assert vars(stored.cell(1, 3).value) == vars(table)
+
+
+def test_content_which_can_not_be_stored_is_reported(tmp_path, caplog):
+    source = create_workbook(str(tmp_path / "data.xlsx"))
+    parser = CountingParser(parse_as(["text", 1j]))
+    store = SnapshotStore(str(tmp_path / "store"), parser)
+    with caplog.at_level(logging.WARNING):
+        store.load(source)
+        store.load(source)
+    assert parser.calls == 2
+    assert len(caplog.records) == 2
+    assert source in caplog.records[0].getMessage()
+    assert "complex" in caplog.records[0].getMessage()
+
+
+def test_dropped_snapshots_release_their_mapped_files(tmp_path):
+    first = create_workbook(str(tmp_path / "first.xlsx"))
+    second = str(tmp_path / "second.xlsx")
+    wb = load_workbook(first)
+    wb["Workers"].append(["carol", 53])
+    wb.save(second)
+    store_dir = str(tmp_path / "store")
+    store = SnapshotStore(store_dir)
+    store.load(first)
+    store.load(second)
+    cache = WorkbookCache(max_entries=1, loader=store.load)
+    evicted = cache.get(first)["Workers"]
+    assert any(isinstance(x, memoryview) for x in evicted.get_arrays())
+    kept = cache.get(second)["Workers"]
+    # the evicted sheet is copied into memory and is still usable by whoever holds it
+    assert not any(isinstance(x, memoryview) for x in evicted.get_arrays())
+    assert evicted.cell(3, 1).value == "bob"
+    assert any(isinstance(x, memoryview) for x in kept.get_arrays())
+    cache.invalidate()
+    assert not any(isinstance(x, memoryview) for x in kept.get_arrays())
+    assert kept.cell(4, 1).value == "carol"
@@ -0,0 +1,48 @@
+import threading
+
+from openpyxl import Workbook
+
+from matcher.xlsx.cache.WorkbookCache import WorkbookCache
+from matcher.xlsx.snapshot.SheetSnapshot import WorkbookSnapshot
+
+
+def create_workbook(path: str) -> str:
+    """
+    Writes a workbook with a single value to the given path
+    """
+    wb = Workbook()
+    wb.active["A1"] = "value"
+    wb.save(path)
+    return path
+
+
+class BlockingLoader:
+    """
+    Loads workbooks like the default loader of the cache but only once it is released
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.released = threading.Event()
+
+    def __call__(self, path: str) -> WorkbookSnapshot:
+        self.started.set()
+        self.released.wait(5)
+        return WorkbookSnapshot.load(path)
+
+
+def test_close_keeps_running_loads_and_drops_waiting_ones(tmp_path):
+    running = create_workbook(str(tmp_path / "running.xlsx"))
+    waiting = create_workbook(str(tmp_path / "waiting.xlsx"))
+    loader = BlockingLoader()
+    cache = WorkbookCache(loader=loader)
+    # one thread only -> the second file waits until the first one is loaded
+    cache.prefetch([running, waiting], 1)
+    assert loader.started.wait(5)
+    threading.Timer(0.1, loader.released.set).start()
+    cache.close()
+    assert cache.get(running)["Sheet"].cell(1, 1).value == "value"
+    assert cache.prefetched == 1
+    # the file which wasn't loaded before is loaded on demand
+    assert cache.get(waiting)["Sheet"].cell(1, 1).value == "value"
+    assert cache.prefetched == 1
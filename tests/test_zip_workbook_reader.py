@@ -0,0 +1,135 @@
+import datetime
+import glob
+import re
+from zipfile import ZipFile
+
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+from openpyxl.styles.colors import Color
+
+from matcher.MatchingManager import MatchingManager
+from matcher.xlsx.snapshot.SheetSnapshot import WorkbookSnapshot
+from matcher.xlsx.snapshot.ZipWorkbookReader import ZipWorkbookReader
+
+SHARED_STRINGS_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"
+
+
+def share_strings(path: str) -> None:
+    """
+    Moves the inline strings openpyxl writes into a shared string table like Excel stores them. Strings starting with
+    "inline" stay where they are
+    """
+    with ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    strings = []
+
+    def share(match) -> str:
+        if match.group(2).startswith("inline"):
+            return match.group(0)
+        strings.append(match.group(2))
+        return '<c {}t="s"><v>{}</v></c>'.format(match.group(1), len(strings) - 1)
+
+    for name in [x for x in parts if x.startswith("xl/worksheets/")]:
+        parts[name] = re.sub(r'<c ([^>]*)t="inlineStr"><is><t>(.*?)</t></is></c>', share,
+                             parts[name].decode()).encode()
+    parts["xl/sharedStrings.xml"] = ('<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">{}</sst>'
+                                     .format("".join("<si><t>{}</t></si>".format(x) for x in strings))).encode()
+    parts["[Content_Types].xml"] = parts["[Content_Types].xml"].replace(
+        b"</Types>", '<Override PartName="/xl/sharedStrings.xml" ContentType="{}"/></Types>'
+        .format(SHARED_STRINGS_TYPE).encode())
+    parts["xl/_rels/workbook.xml.rels"] = parts["xl/_rels/workbook.xml.rels"].replace(
+        b"</Relationships>", b'<Relationship Id="rIdStrings" Target="sharedStrings.xml" Type="http://schemas.'
+                             b'openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/></Relationships>')
+    with ZipFile(path, "w") as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+
+
+def share_formula(path: str, first: str, last: str) -> None:
+    """
+    Turns the formula of the given cell into a shared formula which the cells below it up to the last one given use
+    """
+    with ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    sheet = parts["xl/worksheets/sheet1.xml"].decode()
+    column, first_row, last_row = first[0], int(first[1:]), int(last[1:])
+    sheet = re.sub(r'<c r="{}"><f>'.format(first), '<c r="{}"><f t="shared" ref="{}:{}" si="0">'.format(first, first,
+                                                                                                        last), sheet)
+    for row in range(first_row + 1, last_row + 1):
+        sheet = re.sub(r'<c r="{0}{1}"><f>.*?</f>'.format(column, row),
+                       '<c r="{0}{1}"><f t="shared" si="0"/>'.format(column, row), sheet)
+    parts["xl/worksheets/sheet1.xml"] = sheet.encode()
+    with ZipFile(path, "w") as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+
+
+def create_mixed_workbook(path: str) -> str:
+    """
+    Writes a workbook holding all kinds of contents a cell can have
+    """
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Mixed"
+    sheet.append([1, 1.5, True, "shared", "inline text", datetime.datetime(2020, 1, 2, 3, 4), datetime.date(2021, 5, 6),
+                  datetime.time(3, 4), datetime.timedelta(hours=30)])
+    for row in range(2, 5):
+        sheet.cell(row, 1).value = "=SUM(A1:B1)+{}".format(row)
+    sheet["B2"] = "=A1+1"
+    sheet["B3"] = "=A1+1"
+    sheet["B4"] = "=A1+1"
+    sheet["C3"] = "x"
+    sheet.merge_cells("C3:E3")
+    sheet.merge_cells("H6:I8")
+    sheet["E5"].fill = PatternFill("solid", fgColor="FF00FF00")
+    sheet["F6"].fill = PatternFill("solid", fgColor=Color(indexed=5))
+    sheet["G7"].fill = PatternFill("solid", fgColor=Color(theme=3, tint=0.2))
+    sheet["A10"].hyperlink = "http://example.org"
+    sheet["C8"] = "x005F_y"
+    wb.create_sheet("Empty")
+    colors = wb.create_sheet("Colors")
+    colors["B2"].fill = PatternFill("solid", fgColor="00112233")
+    colors["B3"] = "inline"
+    wb.save(path)
+    share_formula(path, "B2", "B4")
+    share_strings(path)
+    return path
+
+
+def assert_same_snapshots(expected: WorkbookSnapshot, actual: WorkbookSnapshot) -> None:
+    assert expected.sheetnames == actual.sheetnames
+    for name in expected.sheetnames:
+        expected_sheet, actual_sheet = expected[name], actual[name]
+        assert (expected_sheet.max_row, expected_sheet.max_column) == (actual_sheet.max_row, actual_sheet.max_column)
+        assert expected_sheet.get_value_table() == actual_sheet.get_value_table()
+        assert [type(x) for x in expected_sheet.get_value_table()] == [type(x) for x in actual_sheet.get_value_table()]
+        assert expected_sheet.get_color_table() == actual_sheet.get_color_table()
+        assert [list(x) for x in expected_sheet.get_arrays()] == [list(x) for x in actual_sheet.get_arrays()]
+        for row in range(1, expected_sheet.max_row + 1):
+            for column in range(1, expected_sheet.max_column + 1):
+                assert expected_sheet.merged_span(row, column) == actual_sheet.merged_span(row, column)
+
+
+def test_mixed_contents_are_read_like_openpyxl(tmp_path):
+    path = create_mixed_workbook(str(tmp_path / "mixed.xlsx"))
+    snapshot = WorkbookSnapshot.load(path)
+    # make sure the workbook holds what it is meant to
+    assert snapshot["Mixed"].cell(1, 4).value == "shared"
+    assert snapshot["Mixed"].cell(1, 5).value == "inline text"
+    assert snapshot["Mixed"].cell(3, 2).value == "=A2+1"
+    assert snapshot["Mixed"].merged_span(3, 3) == 3
+    assert_same_snapshots(snapshot, ZipWorkbookReader.load(path))
+
+
+def test_generated_workbooks_are_read_like_openpyxl(training_data):
+    files = [training_data + "/data.xlsx"] + glob.glob(training_data + "/sections/*.xlsx")
+    for path in files:
+        assert_same_snapshots(WorkbookSnapshot.load(path), ZipWorkbookReader.load(path))
+
+
+def test_training_results_do_not_depend_on_the_reader(run_matching):
+    paths, _, result = run_matching()
+    zip_paths, _, zip_result = run_matching(**{MatchingManager.READER_KEY: "zip"})
+    assert len(paths) > 0
+    assert zip_paths == paths
+    assert zip_result == result